@@ -11,8 +11,9 @@ from homeassistant.const import (
     Platform,
 )
 from homeassistant.core import HomeAssistant
-from .coordinator import WeatherUpdateCoordinator, WeatherUpdateCoordinatorConfig
-from .const import DOMAIN, MOBILE_URL, PUBLIC_URL, MOBILE_WARNINGS_URL, PUBLIC_WARNINGS_URL, API_METRIC, API_URL_METRIC
+from homeassistant.helpers.storage import Store
+from .coordinator import SNAPSHOT_STORAGE_VERSION, WeatherUpdateCoordinator, WeatherUpdateCoordinatorConfig
+from .const import CONF_STARTUP_PARALLELISM, DEFAULT_STARTUP_PARALLELISM, DOMAIN, MOBILE_URL, PUBLIC_URL, MOBILE_WARNINGS_URL, PUBLIC_WARNINGS_URL, API_METRIC, API_URL_METRIC
 
 PLATFORMS: Final = [Platform.WEATHER, Platform.SENSOR]
 
@@ -42,10 +43,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             api_url=PUBLIC_URL,
             warnings_url=PUBLIC_WARNINGS_URL,
             api_key='1',
+            entry_id=entry.entry_id,
+            startup_parallelism=entry.options.get(CONF_STARTUP_PARALLELISM, DEFAULT_STARTUP_PARALLELISM),
         )
 
         weathercoordinator = WeatherUpdateCoordinator(hass, config)
-        await weathercoordinator.async_config_entry_first_refresh()
+        entry.async_on_unload(weathercoordinator.async_unregister)
+        await _async_start_coordinator(hass, entry, weathercoordinator)
 
         entry.async_on_unload(entry.add_update_listener(_async_update_listener))
         hass.data[DOMAIN][entry.entry_id] = weathercoordinator
@@ -69,10 +73,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             api_url=MOBILE_URL,
             warnings_url=MOBILE_WARNINGS_URL,
             api_key=api_key,
+            entry_id=entry.entry_id,
+            startup_parallelism=entry.options.get(CONF_STARTUP_PARALLELISM, DEFAULT_STARTUP_PARALLELISM),
         )
 
         weathercoordinator = WeatherUpdateCoordinator(hass, config)
-        await weathercoordinator.async_config_entry_first_refresh()
+        entry.async_on_unload(weathercoordinator.async_unregister)
+        await _async_start_coordinator(hass, entry, weathercoordinator)
 
         entry.async_on_unload(entry.add_update_listener(_async_update_listener))
         hass.data[DOMAIN][entry.entry_id] = weathercoordinator
@@ -82,6 +89,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         return True
 
 
+async def _async_start_coordinator(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: WeatherUpdateCoordinator
+) -> None:
+    """Load the first data, from the saved snapshot when there is one."""
+    if not await coordinator.async_restore_snapshot():
+        await coordinator.async_startup_refresh(restored=False)
+        return
+    # Entities start from the snapshot; fresh data follows when this refresh lands.
+    _LOGGER.debug(f"Restored MetService snapshot for {entry.title}")
+    entry.async_create_background_task(
+        hass, coordinator.async_startup_refresh(restored=True), f"{DOMAIN} refresh {entry.entry_id}"
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -91,6 +112,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved snapshot of a deleted entry."""
+    await Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update listener."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,111 @@
+"""Conditional request cache for MetService responses."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+# Upper bound on cached URLs, so changing dataUrls cannot grow the cache forever
+MAX_CACHED_URLS = 128
+
+
+@dataclass
+class CachedResponse:
+    """Class representing a cached, parsed response and its validators."""
+
+    etag: str | None
+    last_modified: str | None
+    data: Any
+    size: int
+
+
+@dataclass
+class EndpointCacheStats:
+    """Class representing cache counters for one endpoint."""
+
+    hits: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters with the hit ratio."""
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / requests, 3) if requests else None,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+class ResponseCache:
+    """Cache parsed responses by URL and revalidate them with ETag / Last-Modified.
+
+    Cached objects are handed out as-is on a 304, so callers must treat them
+    as read-only.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_URLS) -> None:
+        """Initialize."""
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._stats: dict[str, EndpointCacheStats] = {}
+        self._max_entries = max_entries
+
+    def get(self, url: str) -> CachedResponse | None:
+        """Return the cached response for a URL, if any."""
+        return self._entries.get(url)
+
+    def conditional_headers(self, url: str, headers: dict[str, str] | None) -> dict[str, str]:
+        """Return the request headers with validators for a cached URL."""
+        headers = dict(headers or {})
+        if (cached := self._entries.get(url)) is None:
+            return headers
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def store(self, url: str, response_headers, data: Any, size: int) -> None:
+        """Store a fresh response if the server sent validators for it."""
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if not etag and not last_modified:
+            self._entries.pop(url, None)
+            return
+        self._entries[url] = CachedResponse(etag, last_modified, data, size)
+        self._entries.move_to_end(url)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def record_hit(self, endpoint: str, url: str) -> CachedResponse:
+        """Count a 304 for an endpoint and return the cached response."""
+        cached = self._entries[url]
+        self._entries.move_to_end(url)
+        stats = self._stats.setdefault(endpoint, EndpointCacheStats())
+        stats.hits += 1
+        stats.bytes_saved += cached.size
+        return cached
+
+    def record_miss(self, endpoint: str) -> None:
+        """Count a full download for an endpoint."""
+        self._stats.setdefault(endpoint, EndpointCacheStats()).misses += 1
+
+    @property
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return hit/miss ratios and bytes saved per endpoint."""
+        return {endpoint: stats.as_dict() for endpoint, stats in self._stats.items()}
+
+    @property
+    def body_bytes(self) -> int:
+        """Return the size of the cached responses as downloaded."""
+        return sum(cached.size for cached in self._entries.values())
+
+    def payloads(self) -> list[Any]:
+        """Return the cached, parsed responses."""
+        return [cached.data for cached in self._entries.values()]
+
+    def __len__(self) -> int:
+        """Return the number of cached URLs."""
+        return len(self._entries)
@@ -9,14 +9,22 @@ from homeassistant.core import callback
 from homeassistant.const import CONF_LOCATION, CONF_NAME, CONF_API_KEY
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.selector import (
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
     SelectSelector,
     SelectSelectorConfig,
 )
 
 
 from .const import (
+    ATTRIBUTE_MODE_FULL,
+    ATTRIBUTE_MODES,
+    CONF_ATTRIBUTE_MODE,
+    CONF_STARTUP_PARALLELISM,
     DOMAIN,
     DEFAULT_LOCATION,
+    DEFAULT_STARTUP_PARALLELISM,
     LOCATIONS,
 )
 # Add constantS for the tide step
@@ -33,6 +41,13 @@ class WeatherFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a MetService config flow."""
 
     VERSION = 1
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> WeatherOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return WeatherOptionsFlowHandler(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Allow user to decide between mobile API or public API."""
         if user_input is None:
@@ -311,3 +326,37 @@ class WeatherFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             title=self.user_info[CONF_NAME],
             data=self.user_info,
         )
+
+
+class WeatherOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle MetService options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Choose how the forecast and text attributes are recorded, and how many entries start at once."""
+        if user_input is not None:
+            user_input[CONF_STARTUP_PARALLELISM] = int(user_input[CONF_STARTUP_PARALLELISM])
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_ATTRIBUTE_MODE,
+                        default=self._entry.options.get(CONF_ATTRIBUTE_MODE, ATTRIBUTE_MODE_FULL),
+                    ): SelectSelector(
+                        SelectSelectorConfig(options=ATTRIBUTE_MODES, translation_key=CONF_ATTRIBUTE_MODE)
+                    ),
+                    vol.Required(
+                        CONF_STARTUP_PARALLELISM,
+                        default=self._entry.options.get(CONF_STARTUP_PARALLELISM, DEFAULT_STARTUP_PARALLELISM),
+                    ): NumberSelector(
+                        NumberSelectorConfig(min=1, max=10, step=1, mode=NumberSelectorMode.BOX)
+                    ),
+                }
+            ),
+        )
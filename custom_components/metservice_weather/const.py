@@ -8,6 +8,8 @@ from typing import Final
 
 
 DOMAIN = "metservice_weather"
+# hass.data[DOMAIN] key of the state shared by all entries
+DATA_HUB = "hub"
 CONF_ATTRIBUTION = "Data provided by the MetService NZ weather service"
 MANUFACTURER = "MetService"
 
@@ -787,5 +789,26 @@ RESULTS_CURRENT = "current"
 RESULTS_FORECAST_DAILY = "daily"
 RESULTS_FORECAST_HOURLY = "hourly"
 
+FEED_OBSERVATIONS = "observations"
+FEED_WARNINGS = "warnings"
+FEED_FORECAST = "forecast"
+FEED_TIDES = "tides"
+# Health of a feed: fresh, serving its last good data after a failure, or without data
+FEED_OK = "ok"
+FEED_STALE = "stale"
+FEED_MISSING = "missing"
+FEED_STATUSES = [FEED_OK, FEED_STALE, FEED_MISSING]
+
+# How the long forecast and text attributes reach the recorder
+CONF_ATTRIBUTE_MODE = "attribute_mode"
+ATTRIBUTE_MODE_FULL = "full"
+ATTRIBUTE_MODE_UNRECORDED = "unrecorded"
+ATTRIBUTE_MODE_SUBSCRIPTION = "subscription_only"
+ATTRIBUTE_MODES = [ATTRIBUTE_MODE_FULL, ATTRIBUTE_MODE_UNRECORDED, ATTRIBUTE_MODE_SUBSCRIPTION]
+
+# How many entries may run their first refresh at once; the lowest value set on any entry applies
+CONF_STARTUP_PARALLELISM = "startup_parallelism"
+DEFAULT_STARTUP_PARALLELISM = 2
+
 ICON_THERMOMETER = "mdi:thermometer"
 ICON_WIND = "mdi:weather-windy"
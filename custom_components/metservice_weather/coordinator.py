@@ -3,17 +3,22 @@
 from __future__ import annotations
 
 import asyncio
+from copy import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from http import HTTPStatus
 import logging
+import time
 from typing import Any
+from urllib.parse import urlsplit
 
 import aiohttp
 import async_timeout
 from homeassistant.util import dt as dt_util
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.const import (
     PERCENTAGE,
@@ -24,16 +29,132 @@ from homeassistant.const import (
     UnitOfVolumetricFlux,
 )
 
+from .cache import ResponseCache
+from .decode import JsonDecoder
+from .hub import async_get_hub, start_or_join
+from .metrics import STATUS_TIMEOUT, RequestMetrics, RequestSample
+from .model import WeatherSnapshot, build_snapshot
+from .paths import (
+    ACCESSORS_MOBILE,
+    ACCESSORS_PUBLIC,
+    CURRENT_ACCESSORS_MOBILE,
+    CURRENT_ACCESSORS_PUBLIC,
+    PathAccessor,
+    PayloadIndex,
+    count_objects,
+    estimate_size,
+    prune,
+)
+from .ratelimit import BudgetExhaustedError
+from .resilience import (
+    RETRYABLE_STATUSES,
+    CircuitOpenError,
+    TransientResponseError,
+    call_with_retry,
+    parse_retry_after,
+)
+from .spans import Span, root_span, span
+from .scheduler import (
+    FAILED_FEED_RETRY,
+    FEED_POLL_BOUNDS,
+    ISSUE_STAGGER_WINDOW,
+    PUBLICATION_DELAY,
+    STARTUP_PRIORITY_NO_SNAPSHOT,
+    STARTUP_PRIORITY_RESTORED,
+    RefreshScheduler,
+)
 from .const import (
-    SENSOR_MAP_MOBILE,
-    SENSOR_MAP_PUBLIC,
+    DEFAULT_STARTUP_PARALLELISM,
+    DOMAIN,
+    FEED_FORECAST,
+    FEED_MISSING,
+    FEED_OBSERVATIONS,
+    FEED_OK,
+    FEED_STALE,
+    FEED_TIDES,
+    FEED_WARNINGS,
+    FIELD_HUMIDITY,
+    FIELD_PRESSURE,
+    FIELD_TEMP,
+    FIELD_WINDDIR,
+    FIELD_WINDGUST,
+    FIELD_WINDSPEED,
     RESULTS_CURRENT,
     RESULTS_FORECAST_DAILY,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-MIN_TIME_BETWEEN_UPDATES = timedelta(minutes=20)
+# Each feed is only fetched again once its own interval has passed
+FEED_REFRESH_INTERVALS: dict[str, timedelta] = {
+    FEED_OBSERVATIONS: timedelta(minutes=10),
+    FEED_WARNINGS: timedelta(minutes=10),
+    FEED_FORECAST: timedelta(hours=1),
+    FEED_TIDES: timedelta(hours=6),
+}
+# Failed retries a feed's last good data outlasts after its longest poll
+STALENESS_RETRIES = 3
+# Feeds the entities cannot do without, and how long their last good data may
+# stand in for failed refreshes. That is never less than their longest poll
+# with a few retries after it, so one failed poll does not fail the refresh.
+# Other feeds keep their last good data until they next refresh successfully.
+FEED_MAX_STALENESS: dict[str, timedelta] = {
+    feed: max(limit, FEED_POLL_BOUNDS[feed][1] + FAILED_FEED_RETRY * (2**STALENESS_RETRIES - 1))
+    for feed, limit in ((FEED_OBSERVATIONS, timedelta(hours=1)), (FEED_FORECAST, timedelta(hours=6)))
+}
+# Allows for the coordinator firing a moment before a feed interval has fully passed
+FEED_REFRESH_GRACE = timedelta(seconds=30)
+MIN_TIME_BETWEEN_UPDATES = min(FEED_REFRESH_INTERVALS.values())
+# Number of dataUrl fetches allowed in flight at once per coordinator
+DEFAULT_EXPAND_CONCURRENCY = 6
+# Guards against dataUrls that keep pointing at further dataUrls
+MAX_EXPAND_LEVELS = 5
+
+# Where the forecast days sit in the public 7-day page and the mobile payload
+PUBLIC_DAYS_PATH = ("layout", "primary", "slots", "main", "modules", 0, "days")
+MOBILE_DAYS_PATH = ("result", "forecastData", "days")
+
+# Fields that change when new observations come out, unlike the forecast text alongside them
+OBSERVATION_FIELDS = (
+    FIELD_TEMP,
+    "temperatureFeelsLike",
+    FIELD_HUMIDITY,
+    FIELD_PRESSURE,
+    "pressureTendencyTrend",
+    FIELD_WINDDIR,
+    FIELD_WINDSPEED,
+    FIELD_WINDGUST,
+)
+# Size of the reads while streaming the tide table out of the tide page
+TIDE_STREAM_CHUNK_SIZE = 16 * 1024
+# Reported in place of the HTTP status of a response served from the cache while its host is failing
+SERVED_FROM_CACHE = "cache"
+
+SNAPSHOT_STORAGE_VERSION = 1
+# Batches snapshot writes so a burst of refreshes only writes once
+SNAPSHOT_SAVE_DELAY = 10
+
+
+@dataclass
+class FeedState:
+    """Class representing the latest good data of one feed, and any refreshes failing since."""
+
+    data: Any = None
+    fetched_at: datetime | None = None
+    failing_since: datetime | None = None
+    failures: int = 0
+    last_error: str | None = None
+
+    @property
+    def status(self) -> str:
+        """Return whether the feed is ok, stale (serving data from before a failure) or missing."""
+        if self.data is None:
+            return FEED_MISSING
+        return FEED_STALE if self.failures else FEED_OK
+
+
+class IncompleteDataError(Exception):
+    """Part of a payload could not be fetched fresh."""
 
 
 @dataclass
@@ -52,6 +173,9 @@ class WeatherUpdateCoordinatorConfig:
     longitude: str
     enable_tides: bool
     tide_url: str
+    entry_id: str | None = None
+    expand_concurrency: int = DEFAULT_EXPAND_CONCURRENCY
+    startup_parallelism: int = DEFAULT_STARTUP_PARALLELISM
     update_interval = MIN_TIME_BETWEEN_UPDATES
 
 
@@ -77,7 +201,39 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
         self._base_url = 'https://www.metservice.com'
         self.unit_system = config.unit_system
         self.data = None
+        self.weather = WeatherSnapshot()
+        # Counts the data updates, so entities can tell when derived values are stale
+        self.generation = 0
+        self._current_index = PayloadIndex(None)
+        self._daily_index = PayloadIndex(None)
         self._session = async_get_clientsession(self._hass)
+        self._hub = async_get_hub(hass)
+        self._stage_timings: dict[str, float] = {}
+        self._expand_semaphore = asyncio.Semaphore(config.expand_concurrency)
+        self._expansion_rounds: list[dict[str, Any]] = []
+        self._refresh_memo: dict[str, asyncio.Task] = {}
+        self._cache = ResponseCache()
+        self._decoder = JsonDecoder(hass)
+        self._metrics = RequestMetrics()
+        self._last_trace: Span | None = None
+        self._requests_avoided = 0
+        self._requests_avoided_total = 0
+        self._feeds: dict[str, FeedState] = {feed: FeedState() for feed in FEED_REFRESH_INTERVALS}
+        self._prune_stats: dict[str, dict[str, int]] = {}
+        self._scheduler = RefreshScheduler(FEED_REFRESH_INTERVALS)
+        self._last_observations: tuple | None = None
+        self._entry_id = config.entry_id
+        # Where in the stagger period this entry's refreshes have been moved to so far
+        self._applied_offset = timedelta(0)
+        self.next_refresh_at: datetime | None = None
+        # Seconds the first refresh waited in the startup queue
+        self.startup_wait: float | None = None
+        if self._entry_id is not None:
+            self._hub.stagger.register(self._entry_id)
+            self._hub.startup_queue.set_limit(self._entry_id, config.startup_parallelism)
+        self._store: Store | None = None
+        if config.entry_id is not None:
+            self._store = Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{config.entry_id}")
         self.units_of_measurement = (
             UnitOfTemperature.CELSIUS,
             UnitOfLength.MILLIMETERS,
@@ -120,12 +276,504 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
         """Return the tide URL."""
         return self._tide_url
 
+    @property
+    def requests_avoided(self) -> int:
+        """Return how many duplicate requests the last refresh avoided."""
+        return self._requests_avoided
+
+    @property
+    def requests_avoided_total(self) -> int:
+        """Return how many duplicate requests have been avoided since setup."""
+        return self._requests_avoided_total
+
+    async def async_restore_snapshot(self) -> bool:
+        """Seed the data from the last successful refresh, if one was saved."""
+        if self._store is None or (snapshot := await self._store.async_load()) is None:
+            return False
+        for feed, saved in snapshot.get("feeds", {}).items():
+            if feed in self._feeds:
+                fetched_at = saved.get("fetched_at")
+                self._feeds[feed] = FeedState(
+                    saved.get("data"), dt_util.parse_datetime(fetched_at) if fetched_at else None
+                )
+        self._scheduler.restore(snapshot.get("issues", {}))
+        if (observations := snapshot.get("observations")) is not None:
+            self._last_observations = tuple(observations)
+        if self._feeds[FEED_OBSERVATIONS].data is None or self._feeds[FEED_FORECAST].data is None:
+            return False
+        self._set_data(self._merge_feeds())
+        return True
+
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the feeds in their stored form."""
+        return {
+            "feeds": {
+                feed: {
+                    "data": state.data,
+                    "fetched_at": state.fetched_at.isoformat() if state.fetched_at else None,
+                }
+                for feed, state in self._feeds.items()
+            },
+            "issues": self._scheduler.as_store(),
+            "observations": self._last_observations,
+        }
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from API."""
+        self._refresh_memo = {}
+        self._requests_avoided = 0
+        waiting = time.monotonic()
+        try:
+            with root_span("refresh", api=self._api_type) as trace:
+                async with self._hub.stagger.slot():
+                    start = time.monotonic()
+                    trace.attributes["stagger_wait_ms"] = round((start - waiting) * 1000, 1)
+                    try:
+                        if self._api_type == "public":
+                            result = await self.get_public_weather()
+                        else:
+                            result = await self.get_mobile_weather()
+                    finally:
+                        self._record_refresh((time.monotonic() - start) * 1000)
+        finally:
+            self._last_trace = trace
+            # Responses are only shared within a single refresh
+            self._refresh_memo = {}
+            self.update_interval = self._next_refresh_interval() + self._stagger_shift()
+            self.next_refresh_at = dt_util.utcnow() + self.update_interval
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_store, SNAPSHOT_SAVE_DELAY)
+        return result
+
+    async def _single_flight(self, url: str, fetch):
+        """Fetch a URL at most once per refresh, sharing the response between callers."""
+        task, joined = start_or_join(self._refresh_memo, url, fetch)
+        if joined:
+            self._requests_avoided += 1
+            self._requests_avoided_total += 1
+        # Shielded so one caller being cancelled does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    @property
+    def stage_timings(self) -> dict[str, float]:
+        """Return the duration in milliseconds of each stage of the last refresh."""
+        return self._stage_timings
+
+    @property
+    def expansion_rounds(self) -> list[dict[str, Any]]:
+        """Return the count, bytes and latency of each dataUrl expansion round of the last refresh."""
+        return self._expansion_rounds
+
+    async def _timed(self, stage: str, awaitable):
+        """Await a refresh stage, recording how long it took."""
+        start = time.monotonic()
+        try:
+            with span(stage):
+                return await awaitable
+        finally:
+            self._stage_timings[stage] = round((time.monotonic() - start) * 1000, 1)
+
+    @property
+    def last_refresh_trace(self) -> dict[str, Any] | None:
+        """Return the span tree of the last refresh, with the entity writes that followed it."""
+        return None if self._last_trace is None else self._last_trace.as_dict()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing the entity writes under the last refresh."""
+        with span("entity_writes", self._last_trace, listeners=len(self._listeners)):
+            super().async_update_listeners()
+
+    @property
+    def payload_memory(self) -> dict[str, Any]:
+        """Return roughly how many bytes the feeds and the cached responses take in memory.
+
+        Objects shared between them are only counted once, for the feeds.
+        """
+        seen: set[int] = set()
+        feeds = {
+            feed: {"bytes": estimate_size(state.data, seen), "objects": count_objects(state.data)}
+            for feed, state in self._feeds.items()
+        }
+        cache = {
+            "urls": len(self._cache),
+            "body_bytes": self._cache.body_bytes,
+            "bytes": estimate_size(self._cache.payloads(), seen),
+        }
+        return {
+            "feeds": feeds,
+            "cache": cache,
+            "total_bytes": sum(feed["bytes"] for feed in feeds.values()) + cache["bytes"],
+        }
+
+    @property
+    def request_metrics(self) -> RequestMetrics:
+        """Return the request and refresh timings of this coordinator."""
+        return self._metrics
+
+    @property
+    def metric_endpoints(self) -> tuple[str, ...]:
+        """Return the classes of endpoint this coordinator requests."""
+        endpoints = ["current"]
         if self._api_type == "public":
-            return await self.get_public_weather()
-        else:
-            return await self.get_mobile_weather()
+            endpoints.extend(("daily", "warnings"))
+        if self._enable_tides:
+            endpoints.append("tides")
+        return (*endpoints, "data_url")
+
+    @property
+    def domain_metrics(self) -> RequestMetrics:
+        """Return the request and refresh timings of every coordinator."""
+        return self._hub.metrics
+
+    def claim_domain_sensors(self) -> bool:
+        """Return whether this coordinator's entry carries the domain-wide sensors."""
+        return self._entry_id is not None and self._hub.claim_domain_sensors(self._entry_id)
+
+    def _record_request(self, sample: RequestSample) -> None:
+        """Count a request for this coordinator and for the domain."""
+        self._metrics.record_request(sample)
+        self._hub.metrics.record_request(sample)
+        _LOGGER.debug(
+            f"MetService {sample.endpoint} request: {sample.status}, {sample.size} bytes, "
+            f"{sample.latency_ms:.1f}ms"
+            + (f", decoded in {sample.decode_ms:.1f}ms" if sample.decode_ms is not None else "")
+        )
+
+    def _record_refresh(self, duration_ms: float) -> None:
+        """Count the wall time of a refresh for this coordinator and for the domain."""
+        self._metrics.record_refresh(duration_ms)
+        self._hub.metrics.record_refresh(duration_ms)
+
+    @property
+    def cache_stats(self) -> dict[str, dict[str, Any]]:
+        """Return conditional request cache hit/miss ratios and bytes saved per endpoint."""
+        return self._cache.stats
+
+    @property
+    def decode_stats(self) -> dict[str, dict[str, Any]]:
+        """Return JSON decode counts, bytes and on/off-loop timings per endpoint."""
+        return self._decoder.stats
+
+    async def _fetch_json(self, url: str, headers: dict[str, str], missing_message: str, endpoint: str, feed: str):
+        """Fetch a JSON document and check it for MetService errors.
+
+        A document served from the cache while its host is failing raises
+        IncompleteDataError when the feed already has data, so the feed keeps
+        that data and its fetch time instead of passing old data off as new.
+        """
+        status, result, _ = await self._single_flight(url, lambda: self._request_json(url, headers, endpoint))
+        if status == SERVED_FROM_CACHE and self._feeds[feed].data is not None:
+            raise IncompleteDataError(f"{url} was served from the cache while its host is failing")
+        if result is None:
+            raise ValueError(missing_message)
+        self._check_errors(url, result)
+        return result
+
+    async def _request_json(
+        self, url: str, headers: dict[str, str] | None, endpoint: str
+    ) -> tuple[int | str, Any, int]:
+        """Request a JSON document, joining an identical request from any other entry.
+
+        Returns the HTTP status, the parsed body and the number of bytes downloaded.
+        The status is SERVED_FROM_CACHE for a body served from the cache.
+        """
+        return await self._hub.coalesce(
+            url,
+            lambda: self._resilient(
+                url,
+                url,
+                lambda: self._download_json(url, headers, endpoint),
+                lambda cached: (SERVED_FROM_CACHE, cached, 0),
+            ),
+            (headers or {}).get("apiKey"),
+        )
+
+    async def _resilient(self, url: str, cache_key: str, attempt, from_cache):
+        """Run a request under the retry policy and the circuit breaker of its host.
+
+        While the breaker is open, the cached response is served through
+        from_cache instead, if there is one.
+        """
+        try:
+            return await call_with_retry(self._hub.retry_policy, self._hub.breaker(url), attempt)
+        except CircuitOpenError:
+            if (cached := self._cache.get(cache_key)) is None:
+                raise
+            _LOGGER.debug(f"Serving {url} from the cache while its host is failing")
+            return from_cache(cached.data)
+
+    @property
+    def api_budget(self) -> dict[str, Any] | None:
+        """Return the request budget left for the API key, if this coordinator uses one."""
+        if self._api_type != "mobile":
+            return None
+        return self._hub.limiter(self._api_key).as_dict()
+
+    @property
+    def breaker_states(self) -> dict[str, dict[str, Any]]:
+        """Return the circuit breaker state of the hosts this coordinator requests."""
+        hosts = {urlsplit(url).netloc for url in (self._api_url, self._base_url, self._tide_url) if url}
+        return {host: state for host, state in self._hub.breaker_states.items() if host in hosts}
+
+    async def _download_json(self, url: str, headers: dict[str, str] | None, endpoint: str) -> tuple[int, Any, int]:
+        """Download a JSON document, revalidating any cached copy.
+
+        A 304 is answered from the cache and reported as a 200. Statuses worth
+        retrying raise TransientResponseError. Requests made with an API key
+        draw on its budget, which may delay or refuse them.
+        """
+        if api_key := (headers or {}).get("apiKey"):
+            with span("api_budget"):
+                await self._hub.limiter(api_key).acquire()
+        sample = RequestSample(endpoint)
+        with span("fetch", endpoint=endpoint, url=url) as fetch:
+            try:
+                async with async_timeout.timeout(10):
+                    response = await self._session.get(url, headers=self._cache.conditional_headers(url, headers))
+                    sample.status = response.status
+                    _LOGGER.debug(f"Received MetService data from {url}: {response}")
+                    if response.status in RETRYABLE_STATUSES:
+                        response.release()
+                        raise TransientResponseError(url, response.status, parse_retry_after(response.headers))
+                    if response.status == HTTPStatus.NOT_MODIFIED and self._cache.get(url) is not None:
+                        cached = self._cache.record_hit(endpoint, url)
+                        return HTTPStatus.OK, cached.data, 0
+                    body = await response.read()
+                sample.downloaded(len(body))
+                self._cache.record_miss(endpoint)
+                with sample.decoding(), span("decode", bytes=len(body)):
+                    result = await self._decoder.decode(body, endpoint)
+            except asyncio.TimeoutError:
+                sample.status = STATUS_TIMEOUT
+                raise
+            finally:
+                self._record_request(sample)
+                if fetch is not None:
+                    fetch.attributes.update(status=str(sample.status), bytes=sample.size)
+        if response.status == HTTPStatus.OK:
+            self._cache.store(url, response.headers, result, len(body))
+        return response.status, result, len(body)
+
+    @property
+    def feed_updated(self) -> dict[str, datetime | None]:
+        """Return when each data feed was last fetched."""
+        return {feed: state.fetched_at for feed, state in self._feeds.items()}
+
+    @property
+    def warnings_data(self) -> list[dict[str, Any]]:
+        """Return the current warnings, each with a name, text and (public API) period."""
+        warnings = self._feeds[FEED_WARNINGS].data
+        return warnings if isinstance(warnings, list) else []
+
+    @property
+    def warnings_text(self) -> str | None:
+        """Return the current warnings as the text shown by the warnings sensor."""
+        if (warnings := self._feeds[FEED_WARNINGS].data) is None:
+            return None
+        if self._api_type == "mobile":
+            return ' '.join(f"{warning['name']}, {warning['text']}" for warning in warnings)
+        return '\n'.join(f"{warning['name']}, {warning['text']}, {warning['period']}" for warning in warnings)
+
+    @property
+    def tide_data(self) -> list[dict[str, Any]] | None:
+        """Return the raw tide table, if tides are enabled."""
+        return self._feeds[FEED_TIDES].data if self._enable_tides else None
+
+    @property
+    def feed_health(self) -> dict[str, dict[str, Any]]:
+        """Return the status, last good fetch and failures of each feed in use."""
+        return {
+            feed: {
+                "status": state.status,
+                "fetched_at": state.fetched_at,
+                "failing_since": state.failing_since,
+                "consecutive_failures": state.failures,
+                "last_error": state.last_error,
+            }
+            for feed, state in self._feeds.items()
+            if feed != FEED_TIDES or self._enable_tides
+        }
+
+    async def _refresh_feeds(self, feeds: tuple[str, ...], stage, now: datetime) -> None:
+        """Run the refresh stage of some feeds, keeping their last good data if it fails.
+
+        The error is only raised when a feed the entities need has nothing
+        recent enough to fall back on, which fails the whole refresh. A stage
+        held back by the API key budget has not failed: its feeds are left as
+        they are, to be tried again on the next refresh.
+        """
+        try:
+            await stage
+        except BudgetExhaustedError as err:
+            if any(feed in FEED_MAX_STALENESS and self._feeds[feed].data is None for feed in feeds):
+                raise
+            _LOGGER.debug(f"Putting off the MetService {', '.join(feeds)} refresh: {err}")
+        except Exception as err:
+            for feed in feeds:
+                state = self._feeds[feed]
+                state.failing_since = state.failing_since or now
+                state.failures += 1
+                state.last_error = repr(err)
+            if not all(self._can_fall_back(feed, now) for feed in feeds):
+                raise
+            _LOGGER.warning(f"Keeping the last good MetService {', '.join(feeds)} data: {err!r}")
+
+    def _can_fall_back(self, feed: str, now: datetime) -> bool:
+        """Return whether a refresh can go ahead without fresh data for a feed."""
+        if (max_staleness := FEED_MAX_STALENESS.get(feed)) is None:
+            return True
+        state = self._feeds[feed]
+        return state.data is not None and state.fetched_at is not None and now - state.fetched_at <= max_staleness
+
+    def _feed_due(self, feed: str, now: datetime) -> bool:
+        """Return whether a feed has no data yet or the scheduler says it is due."""
+        state = self._feeds[feed]
+        if state.data is None or state.fetched_at is None:
+            return True
+        return now >= self._feed_due_at(feed, state) - FEED_REFRESH_GRACE
+
+    def _feed_due_at(self, feed: str, state: FeedState) -> datetime:
+        """Return when a fetched feed is next due."""
+        return self._scheduler.due_at(feed, state.fetched_at, bool(self.warnings_data))
+
+    def _next_refresh_interval(self) -> timedelta:
+        """Return how long to wait until the first feed in use falls due."""
+        now = dt_util.utcnow()
+        dues = []
+        for feed, state in self._feeds.items():
+            if feed == FEED_TIDES and not self._enable_tides:
+                continue
+            if state.failures or state.fetched_at is None:
+                dues.append(self._scheduler.retry_at(feed, now, state.failures))
+            else:
+                dues.append(self._feed_due_at(feed, state))
+        return self._scheduler.next_refresh(dues, now)
+
+    def _stagger_shift(self) -> timedelta:
+        """Return how far to move the next refresh to reach this entry's place in the stagger.
+
+        Feeds keep the phase of their last fetch, so moving one refresh moves
+        the ones after it too. The shift is only needed again when entries are
+        added or removed.
+        """
+        if self._entry_id is None:
+            return timedelta(0)
+        stagger = self._hub.stagger
+        target = stagger.offset(self._entry_id)
+        shift = (target - self._applied_offset) % stagger.period
+        self._applied_offset = target
+        # Polls for a new issue are spread the same way, over a shorter window
+        self._scheduler.issue_delay = PUBLICATION_DELAY + ISSUE_STAGGER_WINDOW * (target / stagger.period)
+        return shift
+
+    @callback
+    def async_unregister(self) -> None:
+        """Leave the stagger, the startup queue and the domain-wide sensors to the other entries."""
+        if self._entry_id is not None:
+            self._hub.stagger.unregister(self._entry_id)
+            self._hub.startup_queue.remove(self._entry_id)
+            self._hub.release_domain_sensors(self._entry_id)
+
+    async def async_startup_refresh(self, restored: bool) -> None:
+        """Run the first refresh once the startup queue admits it.
+
+        Entries restored from a snapshot already have something to show, so
+        they wait behind those that do not. Only a first refresh without a
+        snapshot raises ConfigEntryNotReady on failure.
+        """
+        priority = STARTUP_PRIORITY_RESTORED if restored else STARTUP_PRIORITY_NO_SNAPSHOT
+        async with self._hub.startup_queue.admit(self._entry_id, priority) as wait:
+            self.startup_wait = wait
+            _LOGGER.debug(f"First MetService refresh for {self._location_name} admitted after {wait:.2f}s")
+            if restored:
+                await self.async_refresh()
+            else:
+                await self.async_config_entry_first_refresh()
+
+    @property
+    def refresh_plan(self) -> dict[str, Any]:
+        """Return this entry's place in the stagger and the shared refresh slots."""
+        stagger = self._hub.stagger.as_dict()
+        return {
+            "next_refresh": self.next_refresh_at,
+            "offset": self._applied_offset.total_seconds(),
+            "entries": len(stagger["offsets"]),
+            "max_concurrent": stagger["max_concurrent"],
+            "running": stagger["running"],
+            "waiting": stagger["waiting"],
+            "startup_wait": self.startup_wait,
+        }
+
+    def _record_issues(self, result_current: Any, now: datetime) -> None:
+        """Learn when the observations and forecast are issued from fresh observations.
+
+        The forecast carries its issue time. New observations are only noticed
+        by their values changing since the last fetch, so the first fetch with
+        nothing to compare against tells nothing about them.
+        """
+        accessors = ACCESSORS_MOBILE if self._api_type == "mobile" else ACCESSORS_PUBLIC
+        index = PayloadIndex(result_current)
+        issued_at = index.find(accessors["validTimeLocal"])
+        if isinstance(issued_at, str):
+            self._scheduler.record_issue(FEED_FORECAST, dt_util.parse_datetime(issued_at))
+        previous = self._feeds[FEED_OBSERVATIONS]
+        observations = tuple(index.find(accessors[field]) for field in OBSERVATION_FIELDS)
+        if (last_observations := self._last_observations) is None:
+            self._last_observations = observations
+            return
+        changed = observations != last_observations
+        self._last_observations = observations
+        if changed:
+            self._scheduler.record_issue(
+                FEED_OBSERVATIONS, self._scheduler.estimate_issue(FEED_OBSERVATIONS, previous.fetched_at, now)
+            )
+        self._scheduler.record_poll(FEED_OBSERVATIONS, now, changed)
+
+    @property
+    def schedule(self) -> dict[str, dict[str, Any]]:
+        """Return when each feed in use is next due, and what is known of its issue times."""
+        schedule = {}
+        for feed, state in self._feeds.items():
+            if feed == FEED_TIDES and not self._enable_tides:
+                continue
+            schedule[feed] = {
+                "next_due": self._feed_due_at(feed, state) if state.fetched_at else None,
+                "cadence": self._scheduler.cadence_info(feed),
+            }
+        return schedule
+
+    @property
+    def prune_stats(self) -> dict[str, dict[str, int]]:
+        """Return the objects fetched and retained after pruning for each pruned feed."""
+        return self._prune_stats
+
+    def _prune_feed(self, feed: str, data: Any, accessors=(), keep=()) -> Any:
+        """Drop everything from a feed payload that no lookup reads."""
+        with span("prune", feed=feed):
+            pruned = prune(data, accessors, keep)
+        self._prune_stats[feed] = {"fetched": count_objects(data), "retained": count_objects(pruned)}
+        _LOGGER.debug(f"Pruned MetService {feed} data: {self._prune_stats[feed]}")
+        return pruned
+
+    def _store_feed(self, feed: str, data: Any, fetched_at: datetime) -> Any:
+        """Keep freshly fetched data for a feed."""
+        self._feeds[feed] = FeedState(data, fetched_at)
+        return data
+
+    def _merge_feeds(self) -> dict[str, Any]:
+        """Merge the latest data of every feed into the view the entities read."""
+        result_current = {
+            **self._feeds[FEED_OBSERVATIONS].data,
+            'weather_warnings': self.warnings_text,
+        }
+        if self._enable_tides:
+            result_current['tideImport'] = self.tide_data
+        return {
+            RESULTS_CURRENT: result_current,
+            RESULTS_FORECAST_DAILY: self._feeds[FEED_FORECAST].data,
+        }
 
     async def get_mobile_weather(self):
         """Get weather data from mobile API."""
@@ -137,43 +785,51 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
             "Connection": "keep-alive",
             "apiKey": self._api_key
         }
-        try:
-            async with async_timeout.timeout(10):
-                url = f"{self._api_url}/{self._latitude}/{self._longitude}"
-                _LOGGER.info(f"Fetching MetService data from {url}")
-                response = await self._session.get(url, headers=headers)
-                result_current = await response.json(content_type=None)
-                if result_current is None:
-                    raise ValueError("No current weather data received.")
-                self._check_errors(url, result_current)
-            warnings_text = '\n'.join([
-                f"{warning['name']}, {warning['markdown']}"
+        now = dt_util.utcnow()
+
+        async def fetch_current():
+            url = f"{self._api_url}/{self._latitude}/{self._longitude}"
+            _LOGGER.info(f"Fetching MetService data from {url}")
+            result_current = await self._timed(
+                "current",
+                self._fetch_json(url, headers, "No current weather data received.", "current", FEED_OBSERVATIONS),
+            )
+            result_current = await self._timed(
+                "current_expand", self.expand_data_urls(result_current, "current", FEED_OBSERVATIONS)
+            )
+            # The mobile payload carries its own warnings, so they refresh with the observations.
+            warnings = [
+                {"name": _strip_markdown(warning['name']), "text": _strip_markdown(warning['markdown'])}
                 for warning in result_current['result']['warnings'].get('previews', [])
-            ]).replace('**', '').replace('#', '').replace('\n', ' ')
-            async with async_timeout.timeout(10):
-                url = f"{self._api_url}/locations/{self.location}/7-days"
-                response = await self._session.get(url, headers=headers)
-                result_daily = await response.json(content_type=None)
-                if result_daily is None:
-                    raise ValueError("No daily forecast data received.")
-                self._check_errors(url, result_daily)
-                await self.expand_data_urls(result_current)
-                await self.expand_data_urls(result_daily)
-            result_current['weather_warnings'] = warnings_text
-            result = {}
-            if self._enable_tides:
-                result_tides = await self.get_tides()
-                result_current['tideImport'] = result_tides
-                result = {
-                    RESULTS_CURRENT: result_current,
-                    RESULTS_FORECAST_DAILY: result_daily,
-                }
-            else:
-                result = {
-                    RESULTS_CURRENT: result_current,
-                    RESULTS_FORECAST_DAILY: result_daily,
-                }
-            self.data = result
+            ]
+            result_current = self._prune_feed(
+                FEED_OBSERVATIONS, result_current, CURRENT_ACCESSORS_MOBILE, [MOBILE_DAYS_PATH]
+            )
+            self._record_issues(result_current, now)
+            self._store_feed(FEED_OBSERVATIONS, result_current, now)
+            self._store_feed(FEED_WARNINGS, warnings, now)
+            # The forecast days come with the observations, so the forecast feed has nothing of its own
+            self._store_feed(FEED_FORECAST, {}, now)
+
+        async def fetch_tides():
+            self._store_feed(FEED_TIDES, await self._timed("tides", self.get_tides()), now)
+
+        try:
+            self._stage_timings = {}
+            self._expansion_rounds = []
+            refresh_start = time.monotonic()
+            stages = []
+            if any(self._feed_due(feed, now) for feed in (FEED_OBSERVATIONS, FEED_WARNINGS, FEED_FORECAST)):
+                stages.append(
+                    self._refresh_feeds((FEED_OBSERVATIONS, FEED_WARNINGS, FEED_FORECAST), fetch_current(), now)
+                )
+            if self._enable_tides and self._feed_due(FEED_TIDES, now):
+                stages.append(self._refresh_feeds((FEED_TIDES,), fetch_tides(), now))
+            await asyncio.gather(*stages)
+            result = self._merge_feeds()
+            self._stage_timings["total"] = round((time.monotonic() - refresh_start) * 1000, 1)
+            _LOGGER.debug(f"MetService refresh stage timings (ms): {self._stage_timings}")
+            self._set_data(result)
             return result
 
         except ValueError as err:
@@ -195,55 +851,80 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
                           "(KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36",
         }
+        now = dt_util.utcnow()
+
+        async def fetch_warnings(location):
+            url = f"{self._warnings_url}/{location['type']}/{location['key']}"
+            result_warnings = await self._timed(
+                "warnings", self._fetch_json(url, headers, "No warnings data received.", "warnings", FEED_WARNINGS)
+            )
+            result_warnings = await self._timed(
+                "warnings_expand", self.expand_data_urls(result_warnings, "warnings", FEED_WARNINGS)
+            )
+            warnings = [
+                {"name": warning['name'], "text": warning['text'], "period": warning['threatPeriod']}
+                for warning in result_warnings.get('warnings', [])
+            ]
+            self._store_feed(FEED_WARNINGS, warnings, now)
+
+        async def fetch_current_and_warnings():
+            if not self._feed_due(FEED_OBSERVATIONS, now):
+                # The warnings only need the location from the last observations.
+                await self._refresh_feeds(
+                    (FEED_WARNINGS,), fetch_warnings(self._feeds[FEED_OBSERVATIONS].data['location']), now
+                )
+                return
+            url = f"{self._api_url}{self.location}"
+            _LOGGER.info(f"Fetching MetService data from {url}")
+            result_current = await self._timed(
+                "current",
+                self._fetch_json(url, headers, "No current weather data received.", "current", FEED_OBSERVATIONS),
+            )
+            _LOGGER.debug(f"result_current is: {result_current}")
+            # The warnings URL is the only request that depends on another response.
+            stages = [
+                self._timed("current_expand", self.expand_data_urls(result_current, "current", FEED_OBSERVATIONS))
+            ]
+            if self._feed_due(FEED_WARNINGS, now):
+                stages.append(self._refresh_feeds((FEED_WARNINGS,), fetch_warnings(result_current['location']), now))
+            result_current, *_ = await asyncio.gather(*stages)
+            # The location is kept for the warnings of later refreshes
+            result_current = self._prune_feed(
+                FEED_OBSERVATIONS, result_current, CURRENT_ACCESSORS_PUBLIC, [("location",)]
+            )
+            self._record_issues(result_current, now)
+            self._store_feed(FEED_OBSERVATIONS, result_current, now)
+
+        async def fetch_daily():
+            url = f"{self._api_url}{self.location}/7-days"
+            result_daily = await self._timed(
+                "daily", self._fetch_json(url, headers, "No daily forecast data received.", "daily", FEED_FORECAST)
+            )
+            result_daily = await self._timed(
+                "daily_expand", self.expand_data_urls(result_daily, "daily", FEED_FORECAST)
+            )
+            result_daily = self._prune_feed(FEED_FORECAST, result_daily, keep=[PUBLIC_DAYS_PATH])
+            self._store_feed(FEED_FORECAST, result_daily, now)
+
+        async def fetch_tides():
+            self._store_feed(FEED_TIDES, await self._timed("tides", self.get_tides()), now)
+
         try:
-            async with async_timeout.timeout(10):
-                url = f"{self._api_url}{self.location}"
-                _LOGGER.info(f"Fetching MetService data from {url}")
-                response = await self._session.get(url, headers=headers)
-                _LOGGER.debug(f"Received MetService data from {url}: {response}")
-                result_current = await response.json(content_type=None)
-                _LOGGER.debug(f"result_current is: {result_current}")
-                if result_current is None:
-                    raise ValueError("No current weather data received.")
-                self._check_errors(url, result_current)
-            await self.expand_data_urls(result_current)
-            async with async_timeout.timeout(10):
-                url = f"{self._warnings_url}/{result_current['location']['type']}/{result_current['location']['key']}"
-                response = await self._session.get(url, headers=headers)
-                result_warnings = await response.json(content_type=None)
-                if result_warnings is None:
-                    raise ValueError("No warnings data received.")
-                self._check_errors(url, result_warnings)
-                await self.expand_data_urls(result_warnings)
-                warnings_text = '\n'.join([
-                    f"{warning['name']}, {warning['text']}, {warning['threatPeriod']}"
-                    for warning in result_warnings.get('warnings', [])
-                ])
-            async with async_timeout.timeout(10):
-                url = f"{self._api_url}{self.location}/7-days"
-                response = await self._session.get(url, headers=headers)
-                result_daily = await response.json(content_type=None)
-                if result_daily is None:
-                    raise ValueError("No daily forecast data received.")
-                self._check_errors(url, result_daily)
-                await self.expand_data_urls(result_daily)
-            result_current['weather_warnings'] = warnings_text
-            result = {}
-            if self._enable_tides:
-                await self.expand_data_urls(result_current)
-                await self.expand_data_urls(result_daily)
-                result_tides = await self.get_tides()
-                result_current['tideImport'] = result_tides
-                result = {
-                    RESULTS_CURRENT: result_current,
-                    RESULTS_FORECAST_DAILY: result_daily,
-                }
-            else:
-                result = {
-                    RESULTS_CURRENT: result_current,
-                    RESULTS_FORECAST_DAILY: result_daily,
-                }
-            self.data = result
+            self._stage_timings = {}
+            self._expansion_rounds = []
+            refresh_start = time.monotonic()
+            stages = []
+            if self._feed_due(FEED_OBSERVATIONS, now) or self._feed_due(FEED_WARNINGS, now):
+                stages.append(self._refresh_feeds((FEED_OBSERVATIONS,), fetch_current_and_warnings(), now))
+            if self._feed_due(FEED_FORECAST, now):
+                stages.append(self._refresh_feeds((FEED_FORECAST,), fetch_daily(), now))
+            if self._enable_tides and self._feed_due(FEED_TIDES, now):
+                stages.append(self._refresh_feeds((FEED_TIDES,), fetch_tides(), now))
+            await asyncio.gather(*stages)
+            result = self._merge_feeds()
+            self._stage_timings["total"] = round((time.monotonic() - refresh_start) * 1000, 1)
+            _LOGGER.debug(f"MetService refresh stage timings (ms): {self._stage_timings}")
+            self._set_data(result)
             return result
 
         except ValueError as err:
@@ -266,15 +947,34 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
                           "(KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36",
         }
         try:
-            async with async_timeout.timeout(10):
-                url = f"{self._tide_url}"
-                _LOGGER.info(f"Fetching tides data from {url}")
-                response = await self._session.get(url, headers=headers)
-                result_tides = await response.json(content_type=None)
-                if result_tides is None:
-                    raise ValueError("No tides data received.")
-                self._check_errors(url, result_tides)
-            await self.expand_data_urls(result_tides)
+            url = f"{self._tide_url}"
+            _LOGGER.info(f"Fetching tides data from {url}")
+            status, tide_data = await self._single_flight(
+                f"{url}#tideData",
+                lambda: self._hub.coalesce(
+                    url,
+                    lambda: self._resilient(
+                        url,
+                        f"{url}#tideData",
+                        lambda: self._stream_tide_data(url, headers),
+                        lambda cached: (SERVED_FROM_CACHE, cached),
+                    ),
+                    "tideData",
+                ),
+            )
+            if status == SERVED_FROM_CACHE and self._feeds[FEED_TIDES].data is not None:
+                raise IncompleteDataError(f"{url} was served from the cache while its host is failing")
+            if status not in (HTTPStatus.OK, SERVED_FROM_CACHE):
+                raise ValueError("No tides data received.")
+            if isinstance(tide_data, dict):
+                # The tide table sits behind a dataUrl, which is all that needs expanding
+                expanded = await self.expand_data_urls({"tideData": tide_data}, "tides", FEED_TIDES)
+                return expanded["tideData"]
+            if tide_data is not None:
+                return tide_data
+            # The tide table is not in the page where expected, so take the long way round
+            result_tides = await self._fetch_json(url, headers, "No tides data received.", "tides", FEED_TIDES)
+            result_tides = await self.expand_data_urls(result_tides, "tides", FEED_TIDES)
             tide_data = result_tides["layout"]["primary"]["slots"]["main"]["modules"][0]["tideData"]
 
             return tide_data
@@ -291,6 +991,52 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
         # finally:
         #     _LOGGER.info(f"Tides data updated: {tide_data if 'tide_data' in locals() else 'No tides data'}")
 
+    async def _stream_tide_data(self, url: str, headers: dict[str, str]) -> tuple[int, Any]:
+        """Pull the tide table out of the tide page as it downloads, without decoding the rest.
+
+        Returns the HTTP status with the table, or with the dataUrl object when
+        the table sits behind one. The table is None when the page has no table
+        where expected, so the caller can fall back to decoding and expanding
+        the whole page.
+        """
+        cache_key = f"{url}#tideData"
+        # Decoding happens as the page streams in, so it is part of the latency here
+        sample = RequestSample("tides")
+        with span("fetch", endpoint="tides", url=url, streamed=True) as fetch:
+            try:
+                async with async_timeout.timeout(10):
+                    response = await self._session.get(
+                        url, headers=self._cache.conditional_headers(cache_key, headers)
+                    )
+                    sample.status = response.status
+                    try:
+                        if response.status in RETRYABLE_STATUSES:
+                            raise TransientResponseError(url, response.status, parse_retry_after(response.headers))
+                        if response.status == HTTPStatus.NOT_MODIFIED and self._cache.get(cache_key) is not None:
+                            return HTTPStatus.OK, self._cache.record_hit("tides", cache_key).data
+                        if response.status != HTTPStatus.OK:
+                            _LOGGER.debug(f"Tide page returned HTTP {response.status}, not streaming it")
+                            return response.status, None
+                        self._cache.record_miss("tides")
+                        tide_data = await self._decoder.extract(
+                            response.content.iter_chunked(TIDE_STREAM_CHUNK_SIZE), "tideData", "tides_stream"
+                        )
+                        sample.downloaded(response.content.total_bytes)
+                    finally:
+                        # Drops the connection instead of reusing it if the table ended before the page did
+                        response.release()
+            except asyncio.TimeoutError:
+                sample.status = STATUS_TIMEOUT
+                raise
+            finally:
+                self._record_request(sample)
+                if fetch is not None:
+                    fetch.attributes.update(status=str(sample.status), bytes=sample.size)
+        if not isinstance(tide_data, list) and not (isinstance(tide_data, dict) and "dataUrl" in tide_data):
+            return HTTPStatus.OK, None
+        self._cache.store(cache_key, response.headers, tide_data, response.content_length or 0)
+        return HTTPStatus.OK, tide_data
+
     def _check_errors(self, url: str, response: dict):
         """Check for errors in the API response."""
         if "errors" not in response:
@@ -299,37 +1045,23 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
             error_messages = "; ".join([e["message"] for e in errors])
             raise ValueError(f"Error from {url}: {error_messages}")
 
-    def get_from_dict(self, data_dict, map_list):
-        """Recursively look for a given key path within a dictionary."""
-        if not map_list:
-            return data_dict
-        if isinstance(data_dict, list):
-            for idx, item in enumerate(data_dict):
-                if map_list[0].isdigit() and idx == int(map_list[0]):
-                    result = self.get_from_dict(item, map_list[1:])
-                    if result is not None:
-                        return result
-                else:
-                    result = self.get_from_dict(item, map_list)
-                    if result is not None:
-                        return result
-        elif isinstance(data_dict, dict):
-            for key, value in data_dict.items():
-                if key == map_list[0]:
-                    result = self.get_from_dict(value, map_list[1:])
-                    if result is not None:
-                        return result
-                else:
-                    result = self.get_from_dict(value, map_list)
-                    if result is not None:
-                        return result
-        return None
+    def _set_data(self, data: dict[str, Any]) -> None:
+        """Take new data, index it for lookups and normalize it for the entities."""
+        with span("extract"):
+            self.data = data
+            self._current_index = PayloadIndex(data[RESULTS_CURRENT])
+            self._daily_index = PayloadIndex(data[RESULTS_FORECAST_DAILY])
+            self.weather = build_snapshot(self)
+        self.generation += 1
+
+    def lookup_current(self, accessor: PathAccessor) -> Any:
+        """Return the value of a path in the current data."""
+        return self._current_index.find(accessor)
 
     def get_current_public(self, field):
         """Get a specific key from the MetService returned data."""
         try:
-            keys = SENSOR_MAP_PUBLIC[field].split(".")
-            result = self.get_from_dict(self.data[RESULTS_CURRENT], keys)
+            result = self._current_index.find(ACCESSORS_PUBLIC[field])
             return result
         except Exception as e:
             _LOGGER.error(f"Error retrieving public sensor '{field}': {e}")
@@ -338,8 +1070,7 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
     def get_current_mobile(self, field):
         """Get a specific key from the MetService returned data."""
         try:
-            keys = SENSOR_MAP_MOBILE[field].split(".")
-            result = self.get_from_dict(self.data[RESULTS_CURRENT], keys)
+            result = self._current_index.find(ACCESSORS_MOBILE[field])
             return result
         except Exception as e:
             _LOGGER.error(f"Error retrieving mobile sensor '{field}': {e}")
@@ -348,12 +1079,11 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
     def get_forecast_daily_public(self, field, day):
         """Get a specific key from the MetService returned data."""
         try:
-            all_days = self.data[RESULTS_FORECAST_DAILY]["layout"]["primary"]["slots"]["main"]["modules"][0]["days"]
+            all_days = self._daily_index.node(PUBLIC_DAYS_PATH)
             if field == "":  # send a blank to get the number of days
                 return len(all_days)
-            this_day = all_days[day]
-            keys = SENSOR_MAP_PUBLIC[field].split(".")
-            result = self.get_from_dict(this_day, keys)
+            all_days[day]  # raises for a day that is not in the forecast
+            result = self._daily_index.find(ACCESSORS_PUBLIC[field], (*PUBLIC_DAYS_PATH, day))
             return result
         except Exception as e:
             _LOGGER.error(f"Error retrieving public forecast daily sensor '{field}' for day {day}: {e}")
@@ -365,56 +1095,126 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
             all_days = self.data["current"]["result"]["forecastData"]["days"]
             if field == "":  # send a blank to get the number of days
                 return len(all_days)
-            this_day = all_days[day]
-            keys = SENSOR_MAP_MOBILE[field].split(".")
-            result = self.get_from_dict(this_day, keys)
+            all_days[day]  # raises for a day that is not in the forecast
+            result = self._current_index.find(ACCESSORS_MOBILE[field], (*MOBILE_DAYS_PATH, day))
             return result
         except Exception as e:
             _LOGGER.error(f"Error retrieving mobile forecast daily sensor '{field}' for day {day}: {e}")
             return None
 
-    @classmethod
-    def _format_timestamp(cls, timestamp_val):
-        """Format timestamp to ISO format in UTC."""
-        return datetime.fromisoformat(timestamp_val).astimezone(dt_util.get_time_zone("UTC")).isoformat()
-
-
-    async def expand_data_urls(self, data, parent=None, key=None):
-        """Recursively expand dataUrl entries in the data, replacing the entire object."""
-        if isinstance(data, dict):
-            if 'dataUrl' in data:
-                url = data['dataUrl']
-                if url.startswith('/'):
-                    full_url = f"{self._base_url}{url}"
-                else:
-                    full_url = url
-                try:
-                    async with async_timeout.timeout(10):
-                        response = await self._session.get(full_url)
-                        if response.status != 200:
-                            _LOGGER.error(f"Error fetching {full_url}: HTTP {response.status}")
-                            if parent is not None and key is not None:
-                                parent[key] = None  # Handle as needed
-                            return
-                        result = await response.json(content_type=None)
-                    # Replace the entire object containing 'dataUrl' with the fetched data
-                    if parent is not None and key is not None:
-                        parent[key] = result
-                    # Continue processing in case there are nested dataUrls
-                    await self.expand_data_urls(result, parent=parent, key=key)
-                except Exception as e:
-                    _LOGGER.error(f"Error fetching dataUrl {full_url}: {e}")
-                    if parent is not None and key is not None:
-                        parent[key] = None  # Handle as needed
-            else:
-                # Recursively process the rest of the dictionary
-                for k in list(data.keys()):
-                    await self.expand_data_urls(data[k], parent=data, key=k)
-        elif isinstance(data, list):
-            # Recursively process each item in the list
-            for idx, item in enumerate(data):
-                await self.expand_data_urls(item, parent=data, key=idx)
+    async def expand_data_urls(self, data, label="data", feed: str | None = None):
+        """Expand dataUrl entries level by level, replacing the entire object.
+
+        Every dataUrl node is collected first, then fetched concurrently under the
+        expansion semaphore and spliced into place. Payloads that contain further
+        dataUrls are expanded in the next round. Splicing copies only the
+        containers along each path, so the input and any cached responses are
+        left untouched; the expanded document is returned.
+
+        A dataUrl that answers with an error status is left empty. One that could
+        not be fetched at all (an exception, a status still failing after the
+        retries, or an open circuit) is too, and one served from the cache while
+        its host is failing is filled from the cache, unless the payload is for
+        a feed that already has good data: then IncompleteDataError is raised so
+        the feed keeps that data and its fetch time instead.
+        """
+        root = copy(data)
+        copied = {id(root)}
+        nodes = _collect_data_urls(data)
+        level = 0
+        failed = 0
+        while nodes:
+            if level >= MAX_EXPAND_LEVELS:
+                _LOGGER.warning(f"Stopped expanding {label} dataUrls after {level} levels")
+                break
+            start = time.monotonic()
+            with span("expand_level", label=label, level=level, count=len(nodes)):
+                results = await asyncio.gather(
+                    *(self._single_flight(_full_url(self._base_url, url), lambda url=url: self._fetch_data_url(url))
+                      for _, url in nodes)
+                )
+            next_nodes = []
+            received = 0
+            for (path, _), (status, result, size) in zip(nodes, results):
+                if status is None or status == SERVED_FROM_CACHE:
+                    failed += 1
+                # Replace the entire object containing 'dataUrl' with the fetched data
+                _splice(root, path, result, copied)
+                received += size
+                # Continue processing in case there are nested dataUrls
+                next_nodes.extend(_collect_data_urls(result, path))
+            expansion_round = {
+                "label": label,
+                "level": level,
+                "count": len(nodes),
+                "bytes": received,
+                "latency_ms": round((time.monotonic() - start) * 1000, 1),
+            }
+            _LOGGER.debug(f"Expanded dataUrls: {expansion_round}")
+            self._expansion_rounds.append(expansion_round)
+            nodes = next_nodes
+            level += 1
+        if failed and feed is not None and self._feeds[feed].data is not None:
+            raise IncompleteDataError(f"{failed} {label} dataUrls could not be fetched fresh")
+        return root
+
+    async def _fetch_data_url(self, url: str) -> tuple[int | str | None, Any, int]:
+        """Fetch a single dataUrl, returning the HTTP status, parsed payload and its size in bytes.
+
+        The status is None when the dataUrl could not be fetched at all, and
+        SERVED_FROM_CACHE when it came from the cache.
+        """
+        full_url = _full_url(self._base_url, url)
+        async with self._expand_semaphore:
+            try:
+                status, result, size = await self._request_json(full_url, None, "data_url")
+                if status not in (HTTPStatus.OK, SERVED_FROM_CACHE):
+                    _LOGGER.error(f"Error fetching {full_url}: HTTP {status}")
+                    return status, None, 0
+                return status, result, size
+            except Exception as e:
+                _LOGGER.error(f"Error fetching dataUrl {full_url}: {e}")
+                return None, None, 0
+
+
+def _strip_markdown(text: str) -> str:
+    """Flatten the markdown of a mobile warning into a single line of text."""
+    return text.replace('**', '').replace('#', '').replace('\n', ' ')
+
+
+def _full_url(base_url: str, url: str) -> str:
+    """Resolve a site-relative dataUrl against the MetService base URL."""
+    if url.startswith('/'):
+        return f"{base_url}{url}"
+    return url
+
+
+def _collect_data_urls(data, path=(), found=None) -> list[tuple[tuple, str]]:
+    """Collect (path, url) for every dataUrl object below data."""
+    if found is None:
+        found = []
+    if isinstance(data, dict):
+        if 'dataUrl' in data:
+            # A dataUrl at the root has nowhere to be spliced back into
+            if path:
+                found.append((path, data['dataUrl']))
         else:
-            # Not a dict or list, do nothing
-            pass
+            for key, value in data.items():
+                _collect_data_urls(value, (*path, key), found)
+    elif isinstance(data, list):
+        for idx, item in enumerate(data):
+            _collect_data_urls(item, (*path, idx), found)
+    return found
+
 
+def _splice(root, path: tuple, value, copied: set[int]) -> None:
+    """Set the value at path, copying any container on the way that is not ours yet."""
+    container = root
+    for key in path[:-1]:
+        child = container[key]
+        if id(child) not in copied:
+            child = copy(child)
+            container[key] = child
+            copied.add(id(child))
+        container = child
+    container[path[-1]] = value
@@ -0,0 +1,192 @@
+"""JSON decoding for MetService responses, kept off the event loop for large bodies."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+import json
+import re
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - Home Assistant ships orjson
+    orjson = None
+
+# Bodies at least this size are decoded in the executor rather than on the loop
+EXECUTOR_DECODE_THRESHOLD = 128 * 1024
+
+loads: Callable[[bytes], Any] = orjson.loads if orjson is not None else json.loads
+
+# The characters that open, close or escape something while scanning for the end of a value
+_STRUCTURE = re.compile(rb'[\[\]{}"\\]')
+_OPENERS = b"[{"
+_CLOSERS = b"]}"
+_WHITESPACE = b" \t\r\n"
+
+
+@dataclass
+class EndpointDecodeStats:
+    """Class representing decode counters for one endpoint."""
+
+    documents: int = 0
+    bytes: int = 0
+    loop_ms: float = 0.0
+    executor_documents: int = 0
+    executor_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters with the time spent decoding on and off the loop."""
+        return {
+            "documents": self.documents,
+            "bytes": self.bytes,
+            "loop_ms": round(self.loop_ms, 2),
+            "executor_documents": self.executor_documents,
+            "executor_ms": round(self.executor_ms, 2),
+        }
+
+
+class JsonDecoder:
+    """Decode response bodies with the fastest available decoder.
+
+    Small bodies are decoded inline, where the executor round trip would cost
+    more than the decode. Larger ones are handed to the executor so they do
+    not stall the event loop.
+    """
+
+    def __init__(self, hass: HomeAssistant, threshold: int = EXECUTOR_DECODE_THRESHOLD) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._threshold = threshold
+        self._stats: dict[str, EndpointDecodeStats] = {}
+
+    async def decode(self, body: bytes, endpoint: str) -> Any:
+        """Return the parsed body, or None for an empty one."""
+        # isspace stops at the first other byte, where strip would copy the body
+        if not body or body.isspace():
+            return None
+        stats = self._stats.setdefault(endpoint, EndpointDecodeStats())
+        stats.documents += 1
+        stats.bytes += len(body)
+        start = time.monotonic()
+        if len(body) < self._threshold:
+            try:
+                return loads(body)
+            finally:
+                stats.loop_ms += (time.monotonic() - start) * 1000
+        try:
+            return await self._hass.async_add_executor_job(loads, body)
+        finally:
+            stats.executor_documents += 1
+            stats.executor_ms += (time.monotonic() - start) * 1000
+
+    async def extract(self, chunks: AsyncIterator[bytes], key: str, endpoint: str) -> Any:
+        """Return the first array or object stored under key in a streamed document.
+
+        Only the bytes from the key onwards are kept, and reading stops as soon
+        as the value is complete. Returns None if the document has no such
+        value before it ends.
+        """
+        stats = self._stats.setdefault(endpoint, EndpointDecodeStats())
+        marker = json.dumps(key).encode()
+        buffer = bytearray()
+        found = False
+        scanner = _ValueScanner()
+        received = 0
+        async for chunk in chunks:
+            received += len(chunk)
+            buffer += chunk
+            if not found:
+                value_start, keep_from = _find_value(buffer, marker)
+                if value_start is None:
+                    # Keep just enough to finish a key split across chunks
+                    del buffer[:keep_from]
+                    continue
+                if value_start < 0:
+                    # Not an array or object
+                    return None
+                del buffer[:value_start]
+                found = True
+            if (end := scanner.feed(buffer)) is not None:
+                start = time.monotonic()
+                try:
+                    return loads(bytes(buffer[:end]))
+                finally:
+                    stats.documents += 1
+                    stats.bytes += received
+                    stats.loop_ms += (time.monotonic() - start) * 1000
+        return None
+
+    @property
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return decode counts, bytes and timings per endpoint."""
+        return {endpoint: stats.as_dict() for endpoint, stats in self._stats.items()}
+
+
+def _find_value(buffer: bytearray, marker: bytes) -> tuple[int | None, int]:
+    """Look for the value of the key in marker.
+
+    Returns where the value starts (-1 if it is not an array or object) or None
+    if it has not arrived yet, with how much of the buffer can be dropped.
+    """
+    position = 0
+    while (found := buffer.find(marker, position)) >= 0:
+        position = _skip_whitespace(buffer, found + len(marker))
+        if position == len(buffer):
+            return None, found
+        if buffer[position] != ord(":"):
+            # The same text as a string value rather than a key
+            continue
+        position = _skip_whitespace(buffer, position + 1)
+        if position == len(buffer):
+            return None, found
+        return (position if buffer[position] in _OPENERS else -1), found
+    return None, max(0, len(buffer) - len(marker) + 1)
+
+
+def _skip_whitespace(buffer: bytearray, position: int) -> int:
+    """Return the position of the next non-whitespace byte, or the end of the buffer."""
+    while position < len(buffer) and buffer[position] in _WHITESPACE:
+        position += 1
+    return position
+
+
+class _ValueScanner:
+    """Track nesting through a JSON array or object as its bytes arrive."""
+
+    __slots__ = ("_depth", "_in_string", "_position")
+
+    def __init__(self) -> None:
+        """Start before the opening bracket."""
+        self._depth = 0
+        self._in_string = False
+        self._position = 0
+
+    def feed(self, buffer: bytearray) -> int | None:
+        """Scan the new bytes, returning the end of the value once it is complete."""
+        position = self._position
+        while (match := _STRUCTURE.search(buffer, position)) is not None:
+            char = buffer[match.start()]
+            position = match.end()
+            if self._in_string:
+                if char == ord("\\"):
+                    if position == len(buffer):
+                        # The escaped character has not arrived yet
+                        position = match.start()
+                        break
+                    position += 1
+                elif char == ord('"'):
+                    self._in_string = False
+            elif char == ord('"'):
+                self._in_string = True
+            elif char in _OPENERS:
+                self._depth += 1
+            elif char in _CLOSERS:
+                self._depth -= 1
+                if self._depth == 0:
+                    return position
+        self._position = position
+        return None
@@ -0,0 +1,252 @@
+"""Diagnostic sensors reporting how the MetService integration itself is doing."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, FEED_STATUSES, MANUFACTURER
+from .coordinator import WeatherUpdateCoordinator
+from .metrics import RequestMetrics
+from .resilience import BREAKER_STATES
+
+# How the classes of endpoint are named in the request time sensors
+ENDPOINT_NAMES = {
+    "current": "Current conditions",
+    "daily": "Forecast",
+    "warnings": "Warnings",
+    "tides": "Tides",
+    "data_url": "dataUrl",
+}
+
+
+class DiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Base for the sensors reporting on the integration rather than the weather."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator: WeatherUpdateCoordinator, key: str, name: str) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        self._attr_name = name
+        self._attr_unique_id = f"{coordinator.location_name},{key}".lower()
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.location)},
+            name=coordinator.location_name,
+            manufacturer=MANUFACTURER,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Stay available through failed refreshes, which are what these report."""
+        return True
+
+    def _report_domain_wide(self, key: str, name: str) -> None:
+        """Report on every location rather than this one, outside its device."""
+        self._attr_name = f"MetService {name[0].lower()}{name[1:]}"
+        self._attr_unique_id = f"{DOMAIN},{key}"
+        self._attr_device_info = None
+
+
+class FeedHealthSensor(DiagnosticSensor):
+    """Whether a feed is fresh, serving its last good data, or missing."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = FEED_STATUSES
+    _attr_icon = "mdi:heart-pulse"
+    # Change with every refresh, and are only of use as they stand
+    _unrecorded_attributes = frozenset({"next_due", "cadence"})
+
+    def __init__(self, coordinator: WeatherUpdateCoordinator, feed: str) -> None:
+        """Initialize."""
+        super().__init__(coordinator, f"feed_health_{feed}", f"{feed.capitalize()} feed")
+        self._feed = feed
+
+    @property
+    def native_value(self) -> str:
+        """Return the feed status."""
+        return self.coordinator.feed_health[self._feed]["status"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return when the feed last refreshed, how it has been failing since, and when it is next due."""
+        health = dict(self.coordinator.feed_health[self._feed])
+        del health["status"]
+        return {**health, **self.coordinator.schedule[self._feed]}
+
+
+class ConnectionSensor(DiagnosticSensor):
+    """The worst circuit breaker state of the MetService hosts a location uses."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = BREAKER_STATES
+    _attr_icon = "mdi:lan-connect"
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator: WeatherUpdateCoordinator) -> None:
+        """Initialize."""
+        super().__init__(coordinator, "connection", "Connection")
+
+    @property
+    def native_value(self) -> str:
+        """Return closed, half_open or open."""
+        states = [breaker["state"] for breaker in self.coordinator.breaker_states.values()]
+        return max(states, key=BREAKER_STATES.index, default=BREAKER_STATES[0])
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the breaker of each host."""
+        return self.coordinator.breaker_states
+
+
+class ApiBudgetSensor(DiagnosticSensor):
+    """Requests left in the budget of the mobile API key, shared by every location using it."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "requests"
+    _attr_icon = "mdi:speedometer"
+    _unrecorded_attributes = frozenset({"capacity", "refill_per_hour", "granted", "waited", "rejected"})
+
+    def __init__(self, coordinator: WeatherUpdateCoordinator) -> None:
+        """Initialize."""
+        super().__init__(coordinator, "api_budget", "API budget")
+
+    @property
+    def native_value(self) -> float:
+        """Return the requests left."""
+        return self.coordinator.api_budget["remaining"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the size and refill rate of the budget, and how the requests fared."""
+        budget = dict(self.coordinator.api_budget)
+        del budget["remaining"]
+        return budget
+
+
+class NextRefreshSensor(DiagnosticSensor):
+    """When the location next refreshes, and its place among the staggered refreshes of all entries."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:timer-refresh-outline"
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset(
+        {"offset", "entries", "max_concurrent", "running", "waiting", "startup_wait"}
+    )
+
+    def __init__(self, coordinator: WeatherUpdateCoordinator) -> None:
+        """Initialize."""
+        super().__init__(coordinator, "next_refresh", "Next refresh")
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the time of the next refresh."""
+        return self.coordinator.refresh_plan["next_refresh"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the stagger offset and the shared refresh slots."""
+        plan = dict(self.coordinator.refresh_plan)
+        del plan["next_refresh"]
+        return plan
+
+
+class TimingSensor(DiagnosticSensor):
+    """Base for the sensors reporting the median of a rolling timing histogram."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+    _attr_entity_registry_enabled_default = False
+    # The percentiles and counters add up to kilobytes on every refresh, and are only of use as they stand
+    _unrecorded_attributes = frozenset(
+        {"requests", "bytes", "statuses", "latency_ms", "decode_ms", "size_bytes", "last", "count", "p50", "p90", "p99"}
+    )
+
+    def __init__(self, coordinator: WeatherUpdateCoordinator, key: str, name: str, domain_wide: bool) -> None:
+        """Initialize."""
+        super().__init__(coordinator, key, name)
+        self._domain_wide = domain_wide
+        if domain_wide:
+            self._report_domain_wide(key, name)
+
+    @property
+    def _metrics(self) -> RequestMetrics:
+        """Return the timings of this location, or of every location."""
+        return self.coordinator.domain_metrics if self._domain_wide else self.coordinator.request_metrics
+
+
+class RequestTimeSensor(TimingSensor):
+    """Median time to download the responses of one class of endpoint."""
+
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, coordinator: WeatherUpdateCoordinator, endpoint: str, domain_wide: bool = False) -> None:
+        """Initialize."""
+        super().__init__(
+            coordinator, f"request_time_{endpoint}", f"{ENDPOINT_NAMES[endpoint]} request time", domain_wide
+        )
+        self._endpoint = endpoint
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the median latency."""
+        if (metrics := self._metrics.endpoint(self._endpoint)) is None:
+            return None
+        return _rounded(metrics.latency.percentile(50))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the statuses, and the latency, decode time and size percentiles."""
+        if (metrics := self._metrics.endpoint(self._endpoint)) is None:
+            return {}
+        return metrics.as_dict(buckets=False)
+
+
+class RefreshTimeSensor(TimingSensor):
+    """Median wall time of a whole refresh."""
+
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(self, coordinator: WeatherUpdateCoordinator, domain_wide: bool = False) -> None:
+        """Initialize."""
+        super().__init__(coordinator, "refresh_time", "Refresh time", domain_wide)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the median refresh time."""
+        return _rounded(self._metrics.refresh.percentile(50))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the last refresh time and the percentiles."""
+        return self._metrics.refresh_summary()
+
+
+def _rounded(value: float | None) -> float | None:
+    """Round a timing to a tenth of a millisecond."""
+    return None if value is None else round(value, 1)
+
+
+def diagnostic_sensors(coordinator: WeatherUpdateCoordinator) -> list[SensorEntity]:
+    """Return the diagnostic sensors of a location, and the domain-wide ones if it carries them."""
+    sensors: list[SensorEntity] = [
+        *(FeedHealthSensor(coordinator, feed) for feed in coordinator.feed_health),
+        ConnectionSensor(coordinator),
+        NextRefreshSensor(coordinator),
+        RefreshTimeSensor(coordinator),
+        *(RequestTimeSensor(coordinator, endpoint) for endpoint in coordinator.metric_endpoints),
+    ]
+    if coordinator.api_budget is not None:
+        sensors.append(ApiBudgetSensor(coordinator))
+    if coordinator.claim_domain_sensors():
+        sensors.append(RefreshTimeSensor(coordinator, domain_wide=True))
+        sensors.extend(RequestTimeSensor(coordinator, endpoint, domain_wide=True) for endpoint in ENDPOINT_NAMES)
+    return sensors
@@ -0,0 +1,73 @@
+"""Diagnostics support for MetService weather."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import WeatherUpdateCoordinator
+from .hub import async_get_hub
+
+TO_REDACT = {CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the state of a location and a timing breakdown of its last refresh."""
+    coordinator: WeatherUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    hub = async_get_hub(hass)
+    diagnostics = {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "refresh": {
+            "last_update_success": coordinator.last_update_success,
+            "last_exception": repr(coordinator.last_exception) if coordinator.last_exception else None,
+            "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+            "plan": coordinator.refresh_plan,
+            "stage_timings_ms": coordinator.stage_timings,
+            "expansion_rounds": coordinator.expansion_rounds,
+            "requests_avoided": coordinator.requests_avoided,
+            "requests_avoided_total": coordinator.requests_avoided_total,
+            "spans": coordinator.last_refresh_trace,
+        },
+        "feeds": {
+            feed: {**health, **coordinator.schedule[feed]} for feed, health in coordinator.feed_health.items()
+        },
+        "cache": coordinator.cache_stats,
+        "decode": coordinator.decode_stats,
+        "prune": coordinator.prune_stats,
+        "payload_memory": coordinator.payload_memory,
+        "metrics": coordinator.request_metrics.as_dict(),
+        "breakers": coordinator.breaker_states,
+        "api_budget": coordinator.api_budget,
+        "hub": {
+            "coalescing": hub.coalescing_stats,
+            "stagger": hub.stagger.as_dict(),
+            "startup_queue": hub.startup_queue.as_dict(),
+            "metrics": hub.metrics.as_dict(),
+        },
+    }
+    # The mobile API puts the coordinates, by default those of the home, in its URLs
+    coordinates = [
+        str(entry.data.get(key, getattr(hass.config, key))) for key in (CONF_LATITUDE, CONF_LONGITUDE)
+    ]
+    return _redact_values(diagnostics, coordinates)
+
+
+def _redact_values(data: Any, values: list[str]) -> Any:
+    """Replace the given values wherever they appear in the strings of data."""
+    if isinstance(data, dict):
+        return {key: _redact_values(value, values) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_redact_values(item, values) for item in data]
+    if isinstance(data, str):
+        for value in values:
+            data = data.replace(value, REDACTED)
+    return data
@@ -0,0 +1,131 @@
+"""Domain-wide state shared by every MetService config entry."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import logging
+from typing import Any
+from urllib.parse import urlsplit
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_HUB, DOMAIN
+from .metrics import RequestMetrics
+from .ratelimit import TokenBucket
+from .resilience import CircuitBreaker, RetryPolicy
+from .scheduler import RefreshStagger, StartupQueue
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MetServiceHub:
+    """Coalesce identical in-flight requests from all coordinators, and share their retry state.
+
+    Every coordinator talks to the same few hosts, so the circuit breakers are
+    kept per host here rather than per entry, and the request budgets per API key.
+    The refreshes of all entries are staggered here too, and their first
+    refreshes queued. The request timings of every entry add up to the
+    domain-wide metrics, whose sensors one entry carries.
+    """
+
+    def __init__(self, retry_policy: RetryPolicy | None = None) -> None:
+        """Initialize."""
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self._requests = 0
+        self._merged = 0
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._limiters: dict[str, TokenBucket] = {}
+        self.stagger = RefreshStagger()
+        self.startup_queue = StartupQueue()
+        self.metrics = RequestMetrics()
+        self._domain_sensor_owner: str | None = None
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Return the circuit breaker of the host of a URL."""
+        host = urlsplit(url).netloc
+        if (breaker := self._breakers.get(host)) is None:
+            breaker = self._breakers[host] = CircuitBreaker()
+        return breaker
+
+    def limiter(self, api_key: str) -> TokenBucket:
+        """Return the request budget of an API key."""
+        if (limiter := self._limiters.get(api_key)) is None:
+            limiter = self._limiters[api_key] = TokenBucket()
+        return limiter
+
+    def claim_domain_sensors(self, entry_id: str) -> bool:
+        """Return whether an entry carries the domain-wide sensors, claiming them if no entry does."""
+        if self._domain_sensor_owner in (None, entry_id):
+            self._domain_sensor_owner = entry_id
+            return True
+        return False
+
+    def release_domain_sensors(self, entry_id: str) -> None:
+        """Let the next entry set up claim the domain-wide sensors."""
+        if self._domain_sensor_owner == entry_id:
+            self._domain_sensor_owner = None
+
+    @property
+    def breaker_states(self) -> dict[str, dict[str, Any]]:
+        """Return the circuit breaker state of every host requested so far."""
+        return {host: breaker.as_dict() for host, breaker in self._breakers.items()}
+
+    async def coalesce(
+        self, url: str, fetch: Callable[[], Awaitable[Any]], scope: Hashable = None
+    ) -> Any:
+        """Run fetch, or join the identical request that is already in flight.
+
+        Requests are identical when they share the URL and scope, such as the API key.
+        """
+        key = (url, scope)
+        task, joined = start_or_join(self._in_flight, key, fetch)
+        if joined:
+            self._merged += 1
+            _LOGGER.debug(f"Joined in-flight MetService request for {url}")
+        else:
+            self._requests += 1
+            task.add_done_callback(lambda done: self._release(key, done))
+        # Shielded so one caller being cancelled does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished request."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    @property
+    def coalescing_stats(self) -> dict[str, int]:
+        """Return how many requests were sent and how many joined one in flight."""
+        return {
+            "requests": self._requests,
+            "merged": self._merged,
+            "in_flight": len(self._in_flight),
+        }
+
+
+def start_or_join(
+    tasks: dict[Hashable, asyncio.Task], key: Hashable, fetch: Callable[[], Awaitable[Any]]
+) -> tuple[asyncio.Task, bool]:
+    """Return the task kept under key, starting fetch as one if there is none, and whether it was joined."""
+    if (task := tasks.get(key)) is not None:
+        return task, True
+    task = tasks[key] = asyncio.create_task(fetch())
+    task.add_done_callback(_retrieve_exception)
+    return task, False
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Mark the exception of a shared task as retrieved, in case every caller has gone away."""
+    if not task.cancelled():
+        task.exception()
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> MetServiceHub:
+    """Return the hub, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (hub := domain_data.get(DATA_HUB)) is None:
+        hub = domain_data[DATA_HUB] = MetServiceHub()
+    return hub
@@ -0,0 +1,197 @@
+"""Request and refresh timings, kept in small rolling histograms."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import time
+from typing import Any
+
+# Upper bounds of the histogram buckets; anything larger lands in an overflow bucket
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+DECODE_BUCKETS_MS = (0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+REFRESH_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+# Samples each histogram remembers, so the percentiles follow recent behaviour
+ROLLING_WINDOW = 100
+REPORTED_PERCENTILES = (50, 90, 99)
+
+# Reported in place of an HTTP status for requests that got no answer
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+
+
+class RollingHistogram:
+    """Fixed buckets counting the most recent samples only.
+
+    Percentiles are interpolated within the bucket they fall in, so they are
+    only as precise as the buckets, and kept within the smallest and largest
+    samples of the window.
+    """
+
+    def __init__(self, bounds: Sequence[float], window: int = ROLLING_WINDOW) -> None:
+        """Initialize."""
+        self._bounds = tuple(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def add(self, value: float) -> None:
+        """Count a sample, forgetting the oldest once the window is full."""
+        if len(self._samples) == self._samples.maxlen:
+            self._counts[bisect_left(self._bounds, self._samples[0])] -= 1
+        self._samples.append(value)
+        self._counts[bisect_left(self._bounds, value)] += 1
+
+    @property
+    def count(self) -> int:
+        """Return the samples in the window."""
+        return len(self._samples)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the value below which the given percentage of the samples fall."""
+        if not self._samples:
+            return None
+        low, high = min(self._samples), max(self._samples)
+        rank = percent / 100 * len(self._samples)
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            if count and seen + count >= rank:
+                if bucket == len(self._bounds):
+                    return high
+                lower = self._bounds[bucket - 1] if bucket else 0
+                value = lower + (self._bounds[bucket] - lower) * (rank - seen) / count
+                return min(max(value, low), high)
+            seen += count
+        return high
+
+    def summary(self) -> dict[str, Any]:
+        """Return the sample count and the reported percentiles."""
+        return {
+            "count": self.count,
+            **{f"p{percent}": _round(self.percentile(percent)) for percent in REPORTED_PERCENTILES},
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary with the bucket counts."""
+        return {
+            **self.summary(),
+            "buckets": {
+                **{f"le_{bound:g}": count for bound, count in zip(self._bounds, self._counts)},
+                "overflow": self._counts[-1],
+            },
+        }
+
+
+@dataclass
+class RequestSample:
+    """Class representing the timings of one request as it is made."""
+
+    endpoint: str
+    status: int | str = STATUS_ERROR
+    size: int = 0
+    latency_ms: float | None = None
+    decode_ms: float | None = None
+    started: float = field(default_factory=time.monotonic)
+
+    def downloaded(self, size: int) -> None:
+        """Note the size of the body and how long it took to arrive."""
+        self.size = size
+        self.latency_ms = (time.monotonic() - self.started) * 1000
+
+    @contextmanager
+    def decoding(self) -> Iterator[None]:
+        """Time the decode of the body."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.decode_ms = (time.monotonic() - start) * 1000
+
+    def finish(self) -> None:
+        """Take the latency now if the body never arrived."""
+        if self.latency_ms is None:
+            self.latency_ms = (time.monotonic() - self.started) * 1000
+
+
+class EndpointMetrics:
+    """Statuses, sizes and timings of the requests to one class of endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.requests = 0
+        self.bytes = 0
+        self.statuses: dict[str, int] = {}
+        self.latency = RollingHistogram(LATENCY_BUCKETS_MS)
+        self.decode = RollingHistogram(DECODE_BUCKETS_MS)
+        self.size = RollingHistogram(SIZE_BUCKETS)
+
+    def record(self, sample: RequestSample) -> None:
+        """Count a finished request."""
+        self.requests += 1
+        self.bytes += sample.size
+        status = str(sample.status)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if sample.latency_ms is not None:
+            self.latency.add(sample.latency_ms)
+        if sample.decode_ms is not None:
+            self.decode.add(sample.decode_ms)
+            self.size.add(sample.size)
+
+    def as_dict(self, buckets: bool = True) -> dict[str, Any]:
+        """Return the counters and histograms, with or without their bucket counts."""
+        return {
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "statuses": dict(self.statuses),
+            **{
+                name: histogram.as_dict() if buckets else histogram.summary()
+                for name, histogram in (
+                    ("latency_ms", self.latency), ("decode_ms", self.decode), ("size_bytes", self.size)
+                )
+            },
+        }
+
+
+class RequestMetrics:
+    """Request timings per class of endpoint, and the wall time of whole refreshes."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._endpoints: dict[str, EndpointMetrics] = {}
+        self.refresh = RollingHistogram(REFRESH_BUCKETS_MS)
+        self.last_refresh_ms: float | None = None
+
+    def record_request(self, sample: RequestSample) -> None:
+        """Count a finished request against its endpoint."""
+        sample.finish()
+        if (metrics := self._endpoints.get(sample.endpoint)) is None:
+            metrics = self._endpoints[sample.endpoint] = EndpointMetrics()
+        metrics.record(sample)
+
+    def record_refresh(self, duration_ms: float) -> None:
+        """Count the wall time of a refresh."""
+        self.last_refresh_ms = duration_ms
+        self.refresh.add(duration_ms)
+
+    def endpoint(self, endpoint: str) -> EndpointMetrics | None:
+        """Return the metrics of an endpoint, if it has been requested."""
+        return self._endpoints.get(endpoint)
+
+    def refresh_summary(self) -> dict[str, Any]:
+        """Return the last refresh time and the percentiles."""
+        return {"last": _round(self.last_refresh_ms), **self.refresh.summary()}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the refresh timings and the metrics of every endpoint."""
+        return {
+            "refresh_ms": {"last": _round(self.last_refresh_ms), **self.refresh.as_dict()},
+            "endpoints": {endpoint: metrics.as_dict() for endpoint, metrics in self._endpoints.items()},
+        }
+
+
+def _round(value: float | None) -> float | None:
+    """Round a timing for display."""
+    return None if value is None else round(value, 2)
@@ -0,0 +1,316 @@
+"""Typed snapshot of the MetService data, normalized once per refresh."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONDITION_MAP,
+    FIELD_CONDITIONS,
+    FIELD_DESCRIPTION,
+    FIELD_HUMIDITY,
+    FIELD_PRESSURE,
+    FIELD_TEMP,
+    FIELD_WINDDIR,
+    FIELD_WINDGUST,
+    FIELD_WINDSPEED,
+)
+from .tides import TideTimeline
+
+if TYPE_CHECKING:
+    from .coordinator import WeatherUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def safe_float(value):
+    """Safely convert a value to float, return None if conversion fails."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def format_timestamp(timestamp_val):
+    """Format timestamp to ISO format in UTC."""
+    return datetime.fromisoformat(timestamp_val).astimezone(dt_util.get_time_zone("UTC")).isoformat()
+
+
+@dataclass(slots=True)
+class CurrentConditions:
+    """Class representing the current observations and today's outlook."""
+
+    temperature: Any = None
+    feels_like: Any = None
+    humidity: Any = None
+    pressure: Any = None
+    pressure_trend: Any = None
+    wind_direction: Any = None
+    wind_speed: Any = None
+    wind_gust: Any = None
+    condition: str | None = None
+    description: str | None = None
+    issued_at: str | None = None
+    uv: Any = None
+    pollen_levels: Any = None
+    pollen_type: Any = None
+    drying_morning: Any = None
+    drying_afternoon: Any = None
+    fire_season: Any = None
+    fire_danger: Any = None
+
+
+@dataclass(slots=True)
+class HourlyPoint:
+    """Class representing one hour of the forecast."""
+
+    time: str
+    temperature: float | None
+    precipitation: float | None
+    wind_speed: float | None
+    wind_bearing: Any
+    condition: str
+
+
+@dataclass(slots=True)
+class DailyForecast:
+    """Class representing one day of the forecast."""
+
+    time: Any
+    temp_high: Any
+    temp_low: Any
+    condition: str | None
+
+
+@dataclass(slots=True)
+class TideEvent:
+    """Class representing a high or low tide."""
+
+    time: datetime
+    type: str
+    height: float | None
+
+
+@dataclass(slots=True)
+class WeatherWarning:
+    """Class representing a MetService weather warning."""
+
+    name: str
+    text: str
+    period: str | None = None
+
+
+@dataclass(slots=True)
+class WeatherSnapshot:
+    """Class representing everything the entities read, for one refresh."""
+
+    current: CurrentConditions = field(default_factory=CurrentConditions)
+    hourly: tuple[HourlyPoint, ...] = ()
+    daily: tuple[DailyForecast, ...] = ()
+    tides: TideTimeline = field(default_factory=TideTimeline)
+    warnings: tuple[WeatherWarning, ...] = ()
+    warnings_text: str | None = None
+
+
+# Where each sensor finds its value in the snapshot
+SENSOR_VALUES: dict[str, attrgetter] = {
+    "validTimeLocal": attrgetter("current.issued_at"),
+    FIELD_DESCRIPTION: attrgetter("current.description"),
+    FIELD_HUMIDITY: attrgetter("current.humidity"),
+    "uvIndex": attrgetter("current.uv"),
+    "uvAlert": attrgetter("current.uv"),
+    FIELD_WINDDIR: attrgetter("current.wind_direction"),
+    "temperatureFeelsLike": attrgetter("current.feels_like"),
+    FIELD_TEMP: attrgetter("current.temperature"),
+    FIELD_PRESSURE: attrgetter("current.pressure"),
+    FIELD_WINDGUST: attrgetter("current.wind_gust"),
+    FIELD_WINDSPEED: attrgetter("current.wind_speed"),
+    "pressureTendencyTrend": attrgetter("current.pressure_trend"),
+    "pollen_levels": attrgetter("current.pollen_levels"),
+    "pollen_type": attrgetter("current.pollen_type"),
+    "drying_index_morning": attrgetter("current.drying_morning"),
+    "drying_index_afternoon": attrgetter("current.drying_afternoon"),
+    "fire_season": attrgetter("current.fire_season"),
+    "fire_danger": attrgetter("current.fire_danger"),
+    "weather_warnings": attrgetter("warnings_text"),
+    "tides_high": attrgetter("tides"),
+    "tides_low": attrgetter("tides"),
+    "tide_height": attrgetter("tides"),
+    "tide_trend": attrgetter("tides"),
+}
+
+
+def build_snapshot(coordinator: WeatherUpdateCoordinator) -> WeatherSnapshot:
+    """Normalize the coordinator data of either API into a snapshot."""
+    if coordinator.api_type == "mobile":
+        get = coordinator.get_current_mobile
+        hourly = _build_section("hourly", _build_hourly_mobile, coordinator)
+        daily = _build_section("daily", _build_daily_mobile, coordinator)
+        uv = get("uvAlert")
+    else:
+        get = coordinator.get_current_public
+        hourly = _build_section("hourly", _build_hourly_public, coordinator)
+        daily = _build_section("daily", _build_daily_public, coordinator)
+        uv = get("uvIndex")
+    condition = get(FIELD_CONDITIONS)
+    current = CurrentConditions(
+        temperature=get(FIELD_TEMP),
+        feels_like=get("temperatureFeelsLike"),
+        humidity=get(FIELD_HUMIDITY),
+        pressure=get(FIELD_PRESSURE),
+        pressure_trend=get("pressureTendencyTrend"),
+        wind_direction=get(FIELD_WINDDIR),
+        wind_speed=get(FIELD_WINDSPEED),
+        wind_gust=get(FIELD_WINDGUST),
+        condition=CONDITION_MAP.get(condition, condition),
+        description=get(FIELD_DESCRIPTION),
+        issued_at=get("validTimeLocal"),
+        uv=uv,
+        pollen_levels=get("pollen_levels"),
+        pollen_type=get("pollen_type"),
+        drying_morning=get("drying_index_morning"),
+        drying_afternoon=get("drying_index_afternoon"),
+        fire_season=get("fire_season"),
+        fire_danger=get("fire_danger"),
+    )
+    return WeatherSnapshot(
+        current=current,
+        hourly=hourly,
+        daily=daily,
+        tides=TideTimeline(build_tide_events(coordinator.tide_data)),
+        warnings=tuple(
+            WeatherWarning(warning["name"], warning["text"], warning.get("period"))
+            for warning in coordinator.warnings_data
+        ),
+        warnings_text=coordinator.warnings_text,
+    )
+
+
+def build_tide_events(tide_data: list[dict[str, Any]] | None) -> tuple[TideEvent, ...]:
+    """Parse the tide table into events, skipping entries without a valid time."""
+    if not isinstance(tide_data, list):
+        return ()
+    events = []
+    for tide in tide_data:
+        time = dt_util.parse_datetime(tide["time"])
+        if time is not None:
+            events.append(TideEvent(time, tide["type"], safe_float(tide.get("height"))))
+    return tuple(events)
+
+
+def _build_section(name, build, coordinator: WeatherUpdateCoordinator) -> tuple:
+    """Build one forecast section, leaving it empty if the data does not fit."""
+    try:
+        return tuple(build(coordinator))
+    except Exception as e:
+        _LOGGER.error(f"Error building {name} forecast: {e}")
+        return ()
+
+
+def _hourly_condition(rainfall, wind_speed, date) -> str:
+    """Pick an icon for an hour of the forecast."""
+    icon = "sunny"
+    if rainfall is not None and rainfall > 0:
+        # rainy
+        if rainfall > 6:
+            # pouring
+            icon = "pouring"
+        else:
+            icon = "rainy"
+    else:
+        # clear
+        if wind_speed is not None and wind_speed > 40:
+            # windy
+            icon = "windy"
+        if 7 < datetime.fromisoformat(date).hour < 19:
+            # daytime
+            icon = "partlycloudy"
+        else:
+            # nighttime
+            icon = "clear-night"
+    return icon
+
+
+def _build_hourly_mobile(coordinator: WeatherUpdateCoordinator):
+    """Yield the hourly forecast from the mobile API."""
+    hourly_readings = coordinator.get_current_mobile("hourly_base")
+    for hour in range(0, len(hourly_readings) - 1):
+        this_hour = hourly_readings[hour]
+        rain_fall = safe_float(this_hour.get("rainFall"))
+        wind_speed = safe_float(this_hour.get("windSpeed"))
+        yield HourlyPoint(
+            time=format_timestamp(this_hour["dateISO"]),
+            temperature=safe_float(this_hour.get("temperature")),
+            precipitation=rain_fall,
+            wind_speed=wind_speed,
+            wind_bearing=this_hour.get("windDir"),
+            condition=_hourly_condition(rain_fall, wind_speed, this_hour["dateISO"]),
+        )
+
+
+def _build_hourly_public(coordinator: WeatherUpdateCoordinator):
+    """Yield the hourly forecast from the public API."""
+    get = coordinator.get_current_public
+    hourly_readings = get("hourly_temp")
+    hourly_obs = get("hourly_obs")
+    hourly_skip = get("hourly_skip")
+    if hourly_obs is None:  # Handles regions which do not have daily data
+        hourly_obs = get("hourly_bkp_obs")
+    if hourly_skip is None:
+        hourly_skip = get("hourly_bkp_skip")
+    if hourly_readings is None:
+        hourly_readings = get("hourly_bkp_temp")
+
+    for hour in range(hourly_skip, hourly_obs + hourly_skip):
+        this_hour = hourly_readings[hour]
+        rainfall = safe_float(this_hour.get("rainfall"))
+        wind_speed = safe_float(this_hour["wind"].get("speed"))
+        yield HourlyPoint(
+            time=format_timestamp(this_hour["date"]),
+            temperature=safe_float(this_hour.get("temperature")),
+            precipitation=rainfall,
+            wind_speed=wind_speed,
+            wind_bearing=this_hour["wind"].get("direction"),
+            condition=_hourly_condition(rainfall, wind_speed, this_hour["date"]),
+        )
+
+
+def _build_daily_mobile(coordinator: WeatherUpdateCoordinator):
+    """Yield the daily forecast from the mobile API."""
+    get = coordinator.get_forecast_daily_mobile
+    for day in range(0, get("", 0)):
+        day_condition = get("daily_condition", day)
+        yield DailyForecast(
+            time=get("daily_datetime", day),
+            temp_high=get("daily_temp_high", day),
+            temp_low=get("daily_temp_low", day),
+            condition=CONDITION_MAP.get(day_condition, day_condition),
+        )
+
+
+def _build_daily_public(coordinator: WeatherUpdateCoordinator):
+    """Yield the daily forecast from the public API."""
+    get = coordinator.get_forecast_daily_public
+    for day in range(0, get("", 0)):
+        day_condition = get("daily_condition", day)
+        daily_temp_high = get("daily_temp_high", day)
+        daily_temp_low = get("daily_temp_low", day)
+        daily_datetime = get("daily_datetime", day)
+        if daily_temp_high is None:  # Rural areas have data in a different location
+            daily_temp_high = get("daily_bkp_temp_high", day)
+        if daily_temp_low is None:
+            daily_temp_low = get("daily_bkp_temp_low", day)
+        if daily_datetime is None:
+            daily_datetime = get("daily_bkp_datetime", day)
+        yield DailyForecast(
+            time=daily_datetime,
+            temp_high=daily_temp_high,
+            temp_low=daily_temp_low,
+            condition=CONDITION_MAP.get(day_condition, day_condition),
+        )
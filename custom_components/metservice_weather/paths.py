@@ -0,0 +1,265 @@
+"""Compiled key path lookups over MetService payloads."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import cache
+import sys
+from typing import Any
+
+from .const import SENSOR_MAP_MOBILE, SENSOR_MAP_PUBLIC
+
+_CONTAINERS = (dict, list)
+
+
+class PathAccessor:
+    """Find a dotted key path anywhere below a node.
+
+    Each key of the path may sit at any depth below the previous one, and the
+    first non-None match in document order wins. Digit keys also select list
+    items by index. The path is split and parsed once, and scalar values are
+    never descended into, since they cannot hold the rest of the path.
+    """
+
+    __slots__ = ("path", "_keys", "_indexes", "_last")
+
+    def __init__(self, path: str) -> None:
+        """Compile a dotted path."""
+        self.path = path
+        self._keys = tuple(path.split("."))
+        self._indexes = tuple(int(key) if key.isdigit() else None for key in self._keys)
+        self._last = len(self._keys) - 1
+
+    def get(self, data: Any) -> Any:
+        """Return the first value matching the path below data, or None."""
+        if isinstance(data, _CONTAINERS):
+            return self._find(data, 0)
+        return None
+
+    def _find(self, node: dict | list, pos: int) -> Any:
+        """Search a container for the path from position pos onwards."""
+        if isinstance(node, dict):
+            key = self._keys[pos]
+            for name, value in node.items():
+                if name == key:
+                    if pos == self._last:
+                        result = value
+                    elif isinstance(value, _CONTAINERS):
+                        result = self._find(value, pos + 1)
+                    else:
+                        continue
+                elif isinstance(value, _CONTAINERS):
+                    result = self._find(value, pos)
+                else:
+                    continue
+                if result is not None:
+                    return result
+            return None
+        index = self._indexes[pos]
+        for idx, item in enumerate(node):
+            if idx == index:
+                if pos == self._last:
+                    result = item
+                elif isinstance(item, _CONTAINERS):
+                    result = self._find(item, pos + 1)
+                else:
+                    continue
+            elif isinstance(item, _CONTAINERS):
+                result = self._find(item, pos)
+            else:
+                continue
+            if result is not None:
+                return result
+        return None
+
+    def matches(self, segments: tuple) -> bool:
+        """Return whether the search would reach the node at segments (relative to its root)."""
+        keys = self._keys
+        indexes = self._indexes
+        pos = 0
+        for segment in segments:
+            if pos > self._last:
+                # The path already ended at an ancestor, which would have matched first
+                return False
+            if segment == (keys[pos] if isinstance(segment, str) else indexes[pos]):
+                pos += 1
+        return pos == self._last + 1
+
+    @property
+    def last_key(self) -> str:
+        """Return the final key of the path."""
+        return self._keys[-1]
+
+    def __repr__(self) -> str:
+        """Return the path."""
+        return f"PathAccessor({self.path!r})"
+
+
+class PayloadIndex:
+    """Every dict key of a payload, mapped to its occurrences in document order.
+
+    Built once per update, so a lookup only checks the paths of the nodes that
+    carry the final key instead of walking the whole payload.
+    """
+
+    __slots__ = ("_root", "_occurrences")
+
+    def __init__(self, data: Any) -> None:
+        """Index a payload."""
+        self._root = data
+        self._occurrences: dict[str, list[tuple[tuple, Any]]] = {}
+        if isinstance(data, _CONTAINERS):
+            self._add(data, ())
+
+    def _add(self, node: dict | list, path: tuple) -> None:
+        """Index the keys below a container."""
+        occurrences = self._occurrences
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            child_path = (*path, key)
+            if isinstance(key, str):
+                if (found := occurrences.get(key)) is None:
+                    found = occurrences[key] = []
+                found.append((child_path, value))
+            if isinstance(value, _CONTAINERS):
+                self._add(value, child_path)
+
+    def find(self, accessor: PathAccessor, prefix: tuple = ()) -> Any:
+        """Return what accessor.get would return for the node at prefix."""
+        if accessor.last_key.isdigit():
+            # List indexes are not indexed, so fall back to a walk below the prefix
+            return accessor.get(self.node(prefix))
+        depth = len(prefix)
+        for path, value in self._occurrences.get(accessor.last_key, ()):
+            if value is None or path[:depth] != prefix:
+                continue
+            if accessor.matches(path[depth:]):
+                return value
+        return None
+
+    def locate(self, accessor: PathAccessor, prefix: tuple = ()) -> tuple | None:
+        """Return the path of the node find would return, or None if nothing matches."""
+        if accessor.last_key.isdigit():
+            # List indexes are not indexed, so settle for the whole node at the prefix
+            return prefix if accessor.get(self.node(prefix)) is not None else None
+        depth = len(prefix)
+        for path, value in self._occurrences.get(accessor.last_key, ()):
+            if value is None or path[:depth] != prefix:
+                continue
+            if accessor.matches(path[depth:]):
+                return path
+        return None
+
+    def node(self, prefix: tuple) -> Any:
+        """Return the node at a path, or None."""
+        node = self._root
+        try:
+            for key in prefix:
+                node = node[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return node
+
+    def __len__(self) -> int:
+        """Return the number of distinct keys."""
+        return len(self._occurrences)
+
+
+@cache
+def compile_path(path: str) -> PathAccessor:
+    """Return the compiled accessor for a dotted path."""
+    return PathAccessor(path)
+
+
+ACCESSORS_PUBLIC: dict[str, PathAccessor] = {
+    field: compile_path(path) for field, path in SENSOR_MAP_PUBLIC.items()
+}
+ACCESSORS_MOBILE: dict[str, PathAccessor] = {
+    field: compile_path(path) for field, path in SENSOR_MAP_MOBILE.items()
+}
+# The lookups made on the current conditions payload; the daily fields are
+# only looked up below the forecast days, which are kept whole
+CURRENT_ACCESSORS_PUBLIC: tuple[PathAccessor, ...] = tuple(
+    accessor for field, accessor in ACCESSORS_PUBLIC.items() if not field.startswith("daily_")
+)
+CURRENT_ACCESSORS_MOBILE: tuple[PathAccessor, ...] = tuple(
+    accessor for field, accessor in ACCESSORS_MOBILE.items() if not field.startswith("daily_")
+)
+
+
+def prune(data: Any, accessors: Iterable[PathAccessor] = (), keep: Iterable[tuple] = ()) -> Any:
+    """Return a copy of data holding only what the accessors find and the nodes at keep.
+
+    Matched nodes are kept whole and shared with data, and only the containers
+    on the way to them are rebuilt. Dict keys stay in document order and list
+    items keep their indexes, with None standing in for dropped items, so every
+    accessor finds the same value in the result as in data.
+    """
+    if not isinstance(data, _CONTAINERS):
+        return data
+    index = PayloadIndex(data)
+    tree: dict = {}
+    for path in [*(index.locate(accessor) for accessor in accessors), *keep]:
+        if path is None or index.node(path) is None:
+            continue
+        if not path:
+            return data
+        _add_keep_path(tree, path)
+    if not tree:
+        return type(data)()
+    return _build_pruned(data, tree)
+
+
+def _add_keep_path(tree: dict, path: tuple) -> None:
+    """Mark the node at path to be kept whole."""
+    branch = tree
+    for key in path[:-1]:
+        child = branch.get(key)
+        if child is True:
+            # An ancestor is already kept whole
+            return
+        if child is None:
+            child = branch[key] = {}
+        branch = child
+    branch[path[-1]] = True
+
+
+def _build_pruned(node: dict | list, tree: dict) -> dict | list:
+    """Rebuild a container with only the branches in tree."""
+    if isinstance(node, dict):
+        return {
+            key: value if (branch := tree[key]) is True else _build_pruned(value, branch)
+            for key, value in node.items()
+            if key in tree
+        }
+    pruned: list[Any] = [None] * (max(tree) + 1)
+    for idx, branch in tree.items():
+        pruned[idx] = node[idx] if branch is True else _build_pruned(node[idx], branch)
+    return pruned
+
+
+def count_objects(data: Any) -> int:
+    """Return the number of containers and values in a payload."""
+    if isinstance(data, dict):
+        return 1 + sum(count_objects(value) for value in data.values())
+    if isinstance(data, list):
+        return 1 + sum(count_objects(item) for item in data)
+    return 1
+
+
+def estimate_size(data: Any, seen: set[int] | None = None) -> int:
+    """Return roughly how many bytes a payload takes in memory.
+
+    Objects already measured under the same seen set are not counted again,
+    so payloads sharing objects can be measured one after another.
+    """
+    seen = set() if seen is None else seen
+    if id(data) in seen:
+        return 0
+    seen.add(id(data))
+    size = sys.getsizeof(data)
+    if isinstance(data, dict):
+        size += sum(estimate_size(key, seen) + estimate_size(value, seen) for key, value in data.items())
+    elif isinstance(data, list):
+        size += sum(estimate_size(item, seen) for item in data)
+    return size
@@ -0,0 +1,86 @@
+"""Request budget shared by every entry using the same MetService API key."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Requests a mobile API key may make in a burst, and how quickly the budget refills
+API_KEY_BUDGET = 30
+API_KEY_REFILL_PER_HOUR = 120
+# Longest a request waits for the budget to refill
+MAX_BUDGET_WAIT = 30.0
+
+
+class BudgetExhaustedError(Exception):
+    """A request was held back to stay within the API key budget."""
+
+
+class TokenBucket:
+    """Token bucket limiting the requests made with one API key."""
+
+    def __init__(
+        self,
+        capacity: int = API_KEY_BUDGET,
+        refill_per_hour: float = API_KEY_REFILL_PER_HOUR,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize with a full bucket."""
+        self._capacity = capacity
+        self._rate = refill_per_hour / 3600
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._granted = 0
+        self._waited = 0
+        self._rejected = 0
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update."""
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Return the requests left in the budget."""
+        self._refill()
+        return self._tokens
+
+    async def acquire(self, max_wait: float = MAX_BUDGET_WAIT) -> None:
+        """Take a token for a request.
+
+        Waits for a token if one is due within max_wait, and raises
+        BudgetExhaustedError otherwise.
+        """
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            self._granted += 1
+            return
+        # Taken now, so requests that arrive while this one waits queue up behind it
+        wait = (1 - self._tokens) / self._rate
+        if wait > max_wait:
+            self._rejected += 1
+            raise BudgetExhaustedError(f"API key budget exhausted, next request allowed in {wait:.0f}s")
+        self._tokens -= 1
+        self._granted += 1
+        self._waited += 1
+        _LOGGER.debug(f"Waiting {wait:.1f}s for the MetService API key budget")
+        await asyncio.sleep(wait)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the budget left and how the requests made against it fared."""
+        return {
+            "remaining": round(max(0.0, self.tokens), 1),
+            "capacity": self._capacity,
+            "refill_per_hour": round(self._rate * 3600, 1),
+            "granted": self._granted,
+            "waited": self._waited,
+            "rejected": self._rejected,
+        }
@@ -0,0 +1,209 @@
+"""Retries and circuit breaking for requests to MetService."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+import logging
+import random
+import time
+from typing import Any, TypeVar
+
+import aiohttp
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Responses worth asking again for: rate limiting and server trouble
+RETRYABLE_STATUSES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+# Consecutive failed requests to a host before its breaker opens
+BREAKER_FAILURE_THRESHOLD = 5
+# How long an open breaker rejects requests before letting a trial one through
+BREAKER_COOLDOWN = 300.0
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+BREAKER_STATES = [BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN]
+
+
+class TransientResponseError(aiohttp.ClientError):
+    """MetService answered with a status that may succeed if asked again."""
+
+    def __init__(self, url: str, status: int, retry_after: float | None = None) -> None:
+        """Initialize."""
+        super().__init__(f"HTTP {status} from {url}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Requests to a host are being held back after repeated failures."""
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the seconds to wait from a Retry-After header, given as seconds or a date."""
+    if (value := headers.get("Retry-After")) is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - dt_util.utcnow()).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Class representing how often and how patiently a request is retried."""
+
+    attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, retry: int, retry_after: float | None = None) -> float | None:
+        """Return how long to wait before a retry, or None if the server asked for too long.
+
+        The backoff doubles with each retry, with full jitter so entries that
+        failed together do not retry together.
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+        if retry_after is None:
+            return backoff
+        if retry_after > self.max_delay:
+            return None
+        return max(retry_after, backoff)
+
+
+class CircuitBreaker:
+    """Stop sending requests to a host that keeps failing, and probe it again after a cooldown."""
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize."""
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._open_for = cooldown
+        self._trial_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+        self._last_error: str | None = None
+
+    @property
+    def state(self) -> str:
+        """Return whether the breaker is closed, open or letting a trial request through."""
+        if self._opened_at is None:
+            return BREAKER_CLOSED
+        if self._clock() - self._opened_at < self._open_for:
+            return BREAKER_OPEN
+        return BREAKER_HALF_OPEN
+
+    def before_request(self) -> bool:
+        """Raise CircuitOpenError unless a request may be sent now.
+
+        Returns whether the request is the trial one of a half-open breaker.
+        """
+        state = self.state
+        if state == BREAKER_CLOSED:
+            return False
+        if state == BREAKER_HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self._rejected += 1
+        raise CircuitOpenError(f"Circuit open after {self._failures} failed requests: {self._last_error}")
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self._failures = 0
+        self._opened_at = None
+        self._open_for = self._cooldown
+        self._trial_in_flight = False
+
+    def cancel_trial(self) -> None:
+        """Let another request be the trial if the trial one never got an answer."""
+        self._trial_in_flight = False
+
+    def record_failure(self, err: Exception, retry_after: float | None = None) -> None:
+        """Count a failed request, opening the breaker at the threshold or on a failed trial.
+
+        A Retry-After longer than the cooldown keeps the breaker open for that long instead.
+        """
+        self._failures += 1
+        self._last_error = repr(err)
+        trial_failed = self._trial_in_flight
+        self._trial_in_flight = False
+        if retry_after is not None and retry_after > self._cooldown:
+            self._open(retry_after)
+        elif trial_failed or self._failures >= self._threshold:
+            self._open(self._cooldown)
+
+    def _open(self, duration: float) -> None:
+        """Reject requests for a while."""
+        if self._opened_at is None or self.state == BREAKER_HALF_OPEN:
+            self._times_opened += 1
+            _LOGGER.warning(f"Holding back MetService requests for {duration:.0f}s: {self._last_error}")
+        self._opened_at = self._clock()
+        self._open_for = duration
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the breaker and how it got there."""
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self._failures,
+            "retry_in": (
+                round(self._opened_at + self._open_for - self._clock(), 1) if state == BREAKER_OPEN else None
+            ),
+            "times_opened": self._times_opened,
+            "rejected_requests": self._rejected,
+            "last_error": self._last_error,
+        }
+
+
+async def call_with_retry(
+    policy: RetryPolicy, breaker: CircuitBreaker, attempt: Callable[[], Awaitable[_T]]
+) -> _T:
+    """Run a request attempt, retrying timeouts and client errors with backoff through a breaker."""
+    retry = 0
+    while True:
+        trial = breaker.before_request()
+        try:
+            result = await attempt()
+        except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+            retry_after = getattr(err, "retry_after", None)
+            breaker.record_failure(err, retry_after)
+            retry += 1
+            if retry >= policy.attempts or (delay := policy.delay(retry - 1, retry_after)) is None:
+                raise
+            _LOGGER.debug(f"Retrying MetService request in {delay:.1f}s after {err!r}")
+            await asyncio.sleep(delay)
+        except BaseException:
+            # Cancelled, or held back before reaching the host
+            if trial:
+                breaker.cancel_trial()
+            raise
+        else:
+            breaker.record_success()
+            return result
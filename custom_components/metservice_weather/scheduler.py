@@ -0,0 +1,335 @@
+"""Refresh scheduling that follows when MetService publishes each product."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from hashlib import sha256
+from heapq import heappop, heappush
+from itertools import count
+from statistics import median
+import time
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_STARTUP_PARALLELISM, FEED_FORECAST, FEED_OBSERVATIONS, FEED_WARNINGS
+
+# How long after the expected issue time to poll, so the new issue is out
+PUBLICATION_DELAY = timedelta(minutes=2)
+# Issue times kept per product, and how many it takes to trust the cadence
+ISSUE_HISTORY = 8
+MIN_ISSUES = 3
+# Shortest and longest wait between polls of a feed with a learned cadence
+FEED_POLL_BOUNDS: dict[str, tuple[timedelta, timedelta]] = {
+    FEED_OBSERVATIONS: (timedelta(minutes=5), timedelta(hours=1)),
+    FEED_FORECAST: (timedelta(minutes=10), timedelta(hours=3)),
+}
+# Feeds whose issue times are read from another feed's payload, so polling them
+# cannot tell whether an issue is late
+ISSUED_ELSEWHERE = frozenset({FEED_FORECAST})
+# Wait before polling again when an issue is late, doubling each time it still is
+LATE_ISSUE_RETRY = timedelta(minutes=5)
+# Wait before retrying a feed that failed, doubling up to its fixed interval
+FAILED_FEED_RETRY = timedelta(minutes=2)
+# Poll interval of the feeds that change as warnings develop, while any are in force
+WARNING_ACTIVE_INTERVAL = timedelta(minutes=5)
+WARNING_FEEDS = (FEED_OBSERVATIONS, FEED_WARNINGS)
+# Bounds on the wait between coordinator refreshes
+MIN_REFRESH_INTERVAL = timedelta(minutes=1)
+MAX_REFRESH_INTERVAL = timedelta(hours=1)
+# Period the refreshes of all entries are spread across, and the share of each
+# entry's place in it that is jittered
+STAGGER_PERIOD = timedelta(minutes=10)
+STAGGER_JITTER = 0.5
+# Window after an expected issue that the entries' polls for it are spread across
+ISSUE_STAGGER_WINDOW = timedelta(minutes=5)
+# Refreshes allowed in flight at once across all entries
+MAX_CONCURRENT_REFRESHES = 4
+# Startup order: entries with nothing to show go before those restored from a snapshot
+STARTUP_PRIORITY_NO_SNAPSHOT = 0
+STARTUP_PRIORITY_RESTORED = 1
+
+
+class IssueCadence:
+    """Learn how often a product is issued from the issue times seen so far."""
+
+    def __init__(self) -> None:
+        """Initialize with no issues seen."""
+        self.issues: deque[datetime] = deque(maxlen=ISSUE_HISTORY)
+        self.late_polls = 0
+
+    def record_issue(self, issued_at: datetime) -> bool:
+        """Note an issue time, returning whether it is a new issue."""
+        if self.issues and issued_at <= self.issues[-1]:
+            return False
+        self.issues.append(issued_at)
+        self.late_polls = 0
+        return True
+
+    @property
+    def last_issue(self) -> datetime | None:
+        """Return the latest issue time seen."""
+        return self.issues[-1] if self.issues else None
+
+    @property
+    def interval(self) -> timedelta | None:
+        """Return the typical time between issues, once enough have been seen."""
+        if len(self.issues) < MIN_ISSUES:
+            return None
+        issues = list(self.issues)
+        return median(later - earlier for earlier, later in zip(issues, issues[1:]))
+
+    def next_issue(self, after: datetime) -> datetime | None:
+        """Return when the first issue after a time is expected."""
+        if (interval := self.interval) is None or not interval:
+            return None
+        missed = max(0, (after - self.issues[-1]) // interval)
+        return self.issues[-1] + interval * (missed + 1)
+
+
+class RefreshScheduler:
+    """Decide when each feed is next due, from what MetService has issued so far.
+
+    Feeds with a learned cadence are polled just after the next issue is
+    expected and left alone in between. A late issue is polled for with a
+    doubling retry. Everything else keeps its fixed interval, shortened for
+    the feeds that follow warnings while any are in force.
+    """
+
+    def __init__(self, intervals: dict[str, timedelta]) -> None:
+        """Initialize with the fixed interval of each feed."""
+        self._intervals = intervals
+        self._cadences: dict[str, IssueCadence] = {feed: IssueCadence() for feed in FEED_POLL_BOUNDS}
+        # How long after an expected issue this entry polls for it
+        self.issue_delay = PUBLICATION_DELAY
+
+    def record_issue(self, feed: str, issued_at: datetime | None) -> bool:
+        """Note the issue time of a feed's product, returning whether it is new."""
+        if issued_at is None or (cadence := self._cadences.get(feed)) is None:
+            return False
+        return cadence.record_issue(issued_at)
+
+    def estimate_issue(self, feed: str, previous_poll: datetime | None, polled_at: datetime) -> datetime:
+        """Estimate when a change first seen at polled_at was issued.
+
+        A change found by the poll just after the expected issue time is taken
+        to have come out on time. Otherwise it came out at some point since the
+        previous poll, so the middle of that stretch is the best guess.
+        """
+        cadence = self._cadences[feed]
+        if previous_poll is None:
+            return polled_at
+        expected = cadence.next_issue(cadence.last_issue) if cadence.last_issue else None
+        if expected is not None and previous_poll < expected <= polled_at <= expected + self.issue_delay:
+            return expected
+        earliest = max(previous_poll, expected) if expected is not None and expected <= polled_at else previous_poll
+        return earliest + (polled_at - earliest) / 2
+
+    def record_poll(self, feed: str, polled_at: datetime, new_issue: bool) -> None:
+        """Note a poll that found nothing new after the next issue was due."""
+        if new_issue or (cadence := self._cadences.get(feed)) is None or cadence.last_issue is None:
+            return
+        if (expected := cadence.next_issue(cadence.last_issue)) is not None and polled_at >= expected:
+            cadence.late_polls += 1
+
+    def due_at(self, feed: str, fetched_at: datetime, warnings_active: bool) -> datetime:
+        """Return when a feed fetched at a time should next be fetched."""
+        default = fetched_at + self._intervals[feed]
+        if warnings_active and feed in WARNING_FEEDS:
+            return min(default, fetched_at + WARNING_ACTIVE_INTERVAL)
+        if (cadence := self._cadences.get(feed)) is None or cadence.last_issue is None:
+            return default
+        if cadence.last_issue > fetched_at:
+            # Issued since this feed was fetched, as seen through another feed
+            return fetched_at
+        if (expected := cadence.next_issue(cadence.last_issue)) is None:
+            return default
+        shortest, longest = FEED_POLL_BOUNDS[feed]
+        due = expected + self.issue_delay
+        if due <= fetched_at:
+            # Fetched since the issue was expected, and it has not come out yet
+            if feed in ISSUED_ELSEWHERE:
+                due = fetched_at + longest
+            else:
+                due = fetched_at + LATE_ISSUE_RETRY * 2 ** max(0, cadence.late_polls - 1)
+        return min(max(due, fetched_at + shortest), fetched_at + longest)
+
+    def retry_at(self, feed: str, now: datetime, failures: int) -> datetime:
+        """Return when to try a failing feed again."""
+        return now + min(FAILED_FEED_RETRY * 2 ** max(0, failures - 1), self._intervals[feed])
+
+    def next_refresh(self, dues: list[datetime], now: datetime) -> timedelta:
+        """Return how long to wait for the first of the feeds to fall due."""
+        if not dues:
+            return MAX_REFRESH_INTERVAL
+        return min(max(min(dues) - now, MIN_REFRESH_INTERVAL), MAX_REFRESH_INTERVAL)
+
+    def cadence_info(self, feed: str) -> dict[str, Any] | None:
+        """Return what has been learned about when a feed's product is issued."""
+        if (cadence := self._cadences.get(feed)) is None:
+            return None
+        interval = cadence.interval
+        return {
+            "issues_seen": len(cadence.issues),
+            "last_issue": cadence.last_issue,
+            "issue_interval": interval.total_seconds() if interval else None,
+            "late_polls": cadence.late_polls,
+        }
+
+    def as_store(self) -> dict[str, list[str]]:
+        """Return the issue times in their stored form."""
+        return {
+            feed: [issued_at.isoformat() for issued_at in cadence.issues]
+            for feed, cadence in self._cadences.items()
+        }
+
+    def restore(self, stored: dict[str, list[str]]) -> None:
+        """Seed the issue times from their stored form."""
+        for feed, issues in stored.items():
+            for issued_at in issues:
+                if (parsed := dt_util.parse_datetime(issued_at)) is not None:
+                    self.record_issue(feed, parsed)
+
+
+class RefreshStagger:
+    """Spread the refreshes of every entry evenly over a period, and cap how many run at once.
+
+    Each entry's place in the period comes from its rank among the entry IDs,
+    plus a jitter derived from its ID, so it is the same on every restart.
+    """
+
+    def __init__(
+        self, period: timedelta = STAGGER_PERIOD, max_concurrent: int = MAX_CONCURRENT_REFRESHES
+    ) -> None:
+        """Initialize."""
+        self.period = period
+        self._max_concurrent = max_concurrent
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._entries: set[str] = set()
+        self._running = 0
+        self._waiting = 0
+
+    def register(self, entry_id: str) -> None:
+        """Add an entry to the stagger."""
+        self._entries.add(entry_id)
+
+    def unregister(self, entry_id: str) -> None:
+        """Remove an entry from the stagger."""
+        self._entries.discard(entry_id)
+
+    def offset(self, entry_id: str) -> timedelta:
+        """Return where in the period an entry refreshes."""
+        if entry_id not in self._entries:
+            return timedelta(0)
+        ordered = sorted(self._entries)
+        return self.period * ((ordered.index(entry_id) + _jitter(entry_id) * STAGGER_JITTER) / len(ordered))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the refresh slots while refreshing."""
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        try:
+            yield
+        finally:
+            self._running -= 1
+            self._slots.release()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the offset of every entry and how many refreshes are running and waiting."""
+        return {
+            "period": self.period.total_seconds(),
+            "max_concurrent": self._max_concurrent,
+            "running": self._running,
+            "waiting": self._waiting,
+            "offsets": {entry_id: self.offset(entry_id).total_seconds() for entry_id in sorted(self._entries)},
+        }
+
+
+class StartupQueue:
+    """Admit the first refreshes of the entries a few at a time, most needed first.
+
+    Waiting entries are admitted by priority, then in the order they arrived.
+    Each entry's parallelism setting is kept, and the lowest one applies.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._limits: dict[str, int] = {}
+        self._running = 0
+        self._waiting: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = count()
+        self.waits: dict[str, float] = {}
+
+    @property
+    def parallelism(self) -> int:
+        """Return how many first refreshes may run at once."""
+        return min(self._limits.values(), default=DEFAULT_STARTUP_PARALLELISM)
+
+    def set_limit(self, entry_id: str, limit: int) -> None:
+        """Keep an entry's parallelism setting, admitting more entries if it allows."""
+        self._limits[entry_id] = max(1, limit)
+        self._admit()
+
+    def remove(self, entry_id: str) -> None:
+        """Forget an unloaded entry."""
+        self._limits.pop(entry_id, None)
+        self.waits.pop(entry_id, None)
+        self._admit()
+
+    @asynccontextmanager
+    async def admit(self, entry_id: str, priority: int) -> AsyncIterator[float]:
+        """Wait for a turn, yielding how many seconds the wait took."""
+        start = time.monotonic()
+        if self._running < self.parallelism and not self._waiting:
+            self._running += 1
+        else:
+            turn: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heappush(self._waiting, (priority, next(self._order), turn))
+            try:
+                await turn
+            except asyncio.CancelledError:
+                if turn.done() and not turn.cancelled():
+                    # Admitted just as it was cancelled, so pass the turn on
+                    self._release()
+                raise
+        wait = self.waits[entry_id] = time.monotonic() - start
+        try:
+            yield wait
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        """End a turn, and hand it on to the entries waiting."""
+        self._running -= 1
+        self._admit()
+
+    def _admit(self) -> None:
+        """Give turns to the entries waiting, in order, until the parallelism is reached."""
+        while self._waiting and self._running < self.parallelism:
+            _, _, turn = heappop(self._waiting)
+            if not turn.done():
+                self._running += 1
+                turn.set_result(None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the parallelism, the queue and how long each entry waited."""
+        return {
+            "parallelism": self.parallelism,
+            "running": self._running,
+            "waiting": len(self._waiting),
+            "waits": {entry_id: round(wait, 2) for entry_id, wait in self.waits.items()},
+        }
+
+
+def _jitter(entry_id: str) -> float:
+    """Return a fraction between 0 and 1 that is fixed for an entry."""
+    return int.from_bytes(sha256(entry_id.encode()).digest()[:4], "big") / 2**32
@@ -5,16 +5,19 @@ https://github.com/ciejer/metservice-weather.
 """
 from __future__ import annotations
 
+from datetime import datetime, timedelta
 import logging
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import generate_entity_id
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_time, async_track_time_interval
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
 from typing import Any
@@ -22,13 +25,15 @@ from typing import Any
 from .coordinator import WeatherUpdateCoordinator
 
 from .const import (
+    ATTRIBUTE_MODE_FULL,
+    CONF_ATTRIBUTE_MODE,
     CONF_ATTRIBUTION,
     DOMAIN,
     MANUFACTURER,
-    RESULTS_CURRENT,
-    SENSOR_MAP_MOBILE,
-    SENSOR_MAP_PUBLIC,
 )
+from .diagnostic_sensors import diagnostic_sensors
+from .model import SENSOR_VALUES
+from .tides import TIDE_HIGH, TIDE_LOW, TideTimeline
 from .weather_current_conditions_sensors import (
     current_condition_sensor_descriptions_public,
     current_condition_sensor_descriptions_mobile,
@@ -44,6 +49,13 @@ SENSOR_DESCRIPTIONS_PUBLIC: tuple[
 SENSOR_DESCRIPTIONS_MOBILE: tuple[
     WeatherSensorEntityDescription, ...
 ] = current_condition_sensor_descriptions_mobile
+# Sensors that change state as a tide passes, with the type of tide they wait for (None for any)
+TIDE_SENSOR_TYPES: dict[str, str | None] = {"tides_high": TIDE_HIGH, "tides_low": TIDE_LOW, "tide_trend": None}
+# Sensors interpolated from the tide table, refreshed locally between coordinator polls
+TIDE_LEVEL_SENSORS = {"tide_height"}
+TIDE_LEVEL_INTERVAL = timedelta(minutes=5)
+# Sensors only added to locations with tides enabled
+TIDE_ONLY_SENSORS = {"tide_height", "tide_trend"}
 
 
 async def async_setup_entry(
@@ -51,20 +63,33 @@ async def async_setup_entry(
 ) -> None:
     """Add MetService entities from a config_entry."""
     coordinator: WeatherUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    if entry.options.get(CONF_ATTRIBUTE_MODE, ATTRIBUTE_MODE_FULL) == ATTRIBUTE_MODE_FULL:
+        sensor_class = WeatherSensor
+    else:
+        sensor_class = UnrecordedWeatherSensor
     if entry.data["api"] == "mobile":
-        sensors = [
-            WeatherSensor(coordinator, description)
-            for description in SENSOR_DESCRIPTIONS_MOBILE
-        ]
+        descriptions = SENSOR_DESCRIPTIONS_MOBILE
     else:
-        sensors = [
-            WeatherSensor(coordinator, description)
-            for description in SENSOR_DESCRIPTIONS_PUBLIC
-        ]
+        descriptions = SENSOR_DESCRIPTIONS_PUBLIC
+    sensors = [
+        _sensor_class(description.key, sensor_class)(coordinator, description)
+        for description in descriptions
+        if coordinator.enable_tides or description.key not in TIDE_ONLY_SENSORS
+    ]
+    sensors.extend(diagnostic_sensors(coordinator))
 
     async_add_entities(sensors)
 
 
+def _sensor_class(key: str, default: type[WeatherSensor]) -> type[WeatherSensor]:
+    """Return the entity class for a sensor."""
+    if key in TIDE_SENSOR_TYPES:
+        return TideSensor
+    if key in TIDE_LEVEL_SENSORS:
+        return TideLevelSensor
+    return default
+
+
 class WeatherSensor(CoordinatorEntity, SensorEntity):
     """Implementing the MetService sensor."""
 
@@ -98,14 +123,7 @@ class WeatherSensor(CoordinatorEntity, SensorEntity):
             hass=coordinator.hass,
         )
         self._unit_system = coordinator.unit_system
-        if self.coordinator.api_type == 'mobile':
-            self._sensor_data = _get_sensor_data_mobile(
-                coordinator.data, description.key, self._unit_system
-            )
-        else:
-            self._sensor_data = _get_sensor_data_public(
-                coordinator.data, description.key, self._unit_system
-            )
+        self._sensor_data = _get_sensor_data(coordinator, description.key)
         self._attr_native_unit_of_measurement = self.entity_description.unit_fn(
             self.coordinator.hass.config.units is METRIC_SYSTEM
         )
@@ -155,86 +173,79 @@ class WeatherSensor(CoordinatorEntity, SensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle data update."""
-        if self.coordinator.api_type == 'mobile':
-            self._sensor_data = _get_sensor_data_mobile(
-                self.coordinator.data, self.entity_description.key, self._unit_system
-            )
-        else:
-            self._sensor_data = _get_sensor_data_public(
-                self.coordinator.data, self.entity_description.key, self._unit_system
-            )
+        self._sensor_data = _get_sensor_data(self.coordinator, self.entity_description.key)
         # _LOGGER.info(f"Updated sensor '{self.name}' with data: {self._sensor_data}")
         self.async_write_ha_state()
 
 
-def _get_sensor_data_mobile(sensors: dict[str, Any], kind: str, unit_system: str) -> Any:
-    """Get sensor data."""
+class UnrecordedWeatherSensor(WeatherSensor):
+    """MetService sensor whose full text attributes are not recorded."""
 
-    def get_from_dict(data_dict, map_list):
-        if not map_list:
-            return data_dict
-        if isinstance(data_dict, list):
-            for idx, item in enumerate(data_dict):
-                if map_list[0].isdigit() and idx == int(map_list[0]):
-                    result = get_from_dict(item, map_list[1:])
-                    if result is not None:
-                        return result
-                else:
-                    result = get_from_dict(item, map_list)
-                    if result is not None:
-                        return result
-        elif isinstance(data_dict, dict):
-            for key, value in data_dict.items():
-                if key == map_list[0]:
-                    result = get_from_dict(value, map_list[1:])
-                    if result is not None:
-                        return result
-                else:
-                    result = get_from_dict(value, map_list)
-                    if result is not None:
-                        return result
-        return None
-
-    keys = SENSOR_MAP_MOBILE[kind].split(".")
-    result = get_from_dict(sensors[RESULTS_CURRENT], keys)
-    return result
-    # # windGust is often null. When it is, set it to windSpeed instead.
-    # if kind == FIELD_WINDGUST and sensors[RESULTS_CURRENT][kind] == None:
-    #     return sensors[RESULTS_CURRENT][FIELD_WINDSPEED]
-    # else:
-    #     return sensors[RESULTS_CURRENT][kind]
+    _unrecorded_attributes = frozenset({"full_description", "warnings"})
 
 
-def _get_sensor_data_public(sensors: dict[str, Any], kind: str, unit_system: str) -> Any:
-    """Get sensor data."""
+class TideSensor(WeatherSensor):
+    """MetService next tide sensor, which moves on to the following tide as each one passes."""
+
+    _unsub_tide: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Schedule the first tide change."""
+        await super().async_added_to_hass()
+        self._schedule_tide_change()
+        self.async_on_remove(self._cancel_tide_change)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle data update, rescheduling against the new tide table."""
+        super()._handle_coordinator_update()
+        self._schedule_tide_change()
 
-    def get_from_dict(data_dict, map_list):
-        if not map_list:
-            return data_dict
-        if isinstance(data_dict, list):
-            for idx, item in enumerate(data_dict):
-                if map_list[0].isdigit() and idx == int(map_list[0]):
-                    result = get_from_dict(item, map_list[1:])
-                    if result is not None:
-                        return result
-                else:
-                    result = get_from_dict(item, map_list)
-                    if result is not None:
-                        return result
-        elif isinstance(data_dict, dict):
-            for key, value in data_dict.items():
-                if key == map_list[0]:
-                    result = get_from_dict(value, map_list[1:])
-                    if result is not None:
-                        return result
-                else:
-                    result = get_from_dict(value, map_list)
-                    if result is not None:
-                        return result
-        return None
-
-    keys = SENSOR_MAP_PUBLIC[kind].split(".")
-    result = get_from_dict(sensors[RESULTS_CURRENT], keys)
+    @callback
+    def _schedule_tide_change(self) -> None:
+        """Wake up when the tide currently shown has passed."""
+        self._cancel_tide_change()
+        if not isinstance(self._sensor_data, TideTimeline):
+            return
+        tide_type = TIDE_SENSOR_TYPES[self.entity_description.key]
+        if (next_time := self._sensor_data.next_time(dt_util.utcnow(), tide_type)) is not None:
+            self._unsub_tide = async_track_point_in_time(self.hass, self._async_tide_passed, next_time)
+
+    @callback
+    def _async_tide_passed(self, now: datetime) -> None:
+        """Show the following tide."""
+        self._unsub_tide = None
+        self.async_write_ha_state()
+        self._schedule_tide_change()
+
+    @callback
+    def _cancel_tide_change(self) -> None:
+        """Cancel the scheduled tide change."""
+        if self._unsub_tide is not None:
+            self._unsub_tide()
+            self._unsub_tide = None
+
+
+class TideLevelSensor(WeatherSensor):
+    """MetService tide height sensor, recalculated on a local timer without fetching anything."""
+
+    async def async_added_to_hass(self) -> None:
+        """Start the local timer."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(self.hass, self._async_interval, TIDE_LEVEL_INTERVAL)
+        )
+
+    @callback
+    def _async_interval(self, now: datetime) -> None:
+        """Recalculate the tide height."""
+        if isinstance(self._sensor_data, TideTimeline) and self._sensor_data:
+            self.async_write_ha_state()
+
+
+def _get_sensor_data(coordinator: WeatherUpdateCoordinator, kind: str) -> Any:
+    """Get sensor data."""
+    result = SENSOR_VALUES[kind](coordinator.weather)
     return result
     # # windGust is often null. When it is, set it to windSpeed instead.
     # if kind == FIELD_WINDGUST and sensors[RESULTS_CURRENT][kind] == None:
@@ -0,0 +1,83 @@
+"""Timing spans recording where the time of a refresh went."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+from typing import Any
+
+# The open span that new spans nest under; tasks started during a refresh inherit it
+_current_span: ContextVar[Span | None] = ContextVar("metservice_weather_span", default=None)
+
+
+class Span:
+    """A timed step of a refresh, with the steps it was made of."""
+
+    __slots__ = ("name", "attributes", "children", "started", "duration_ms", "error")
+
+    def __init__(self, name: str, attributes: dict[str, Any]) -> None:
+        """Start timing."""
+        self.name = name
+        self.attributes = attributes
+        self.children: list[Span] = []
+        self.started = time.monotonic()
+        self.duration_ms: float | None = None
+        self.error: str | None = None
+
+    def end(self) -> None:
+        """Stop timing."""
+        self.duration_ms = (time.monotonic() - self.started) * 1000
+
+    def as_dict(self, origin: float | None = None) -> dict[str, Any]:
+        """Return the span tree, with start times relative to the outermost span."""
+        origin = self.started if origin is None else origin
+        span: dict[str, Any] = {
+            "name": self.name,
+            "start_ms": round((self.started - origin) * 1000, 1),
+            "duration_ms": None if self.duration_ms is None else round(self.duration_ms, 1),
+            **self.attributes,
+        }
+        if self.error is not None:
+            span["error"] = self.error
+        if self.children:
+            span["children"] = [child.as_dict(origin) for child in self.children]
+        return span
+
+
+@contextmanager
+def root_span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Open the outermost span of a refresh."""
+    span = Span(name, attributes)
+    with _entered(span):
+        yield span
+
+
+@contextmanager
+def span(name: str, parent: Span | None = None, **attributes: Any) -> Iterator[Span | None]:
+    """Time a step under the open span, or under parent.
+
+    Outside of a refresh there is nothing to nest under, and None is yielded.
+    """
+    if (parent := parent or _current_span.get()) is None:
+        yield None
+        return
+    child = Span(name, attributes)
+    parent.children.append(child)
+    with _entered(child):
+        yield child
+
+
+@contextmanager
+def _entered(span: Span) -> Iterator[None]:
+    """Make a span the open one while it runs, noting any error it ends with."""
+    token = _current_span.set(span)
+    try:
+        yield
+    except BaseException as err:
+        span.error = repr(err)
+        raise
+    finally:
+        span.end()
+        _current_span.reset(token)
@@ -0,0 +1,95 @@
+"""Tide timeline lookups for MetService tide data."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import datetime
+from math import cos, pi
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .model import TideEvent
+
+TIDE_HIGH = "HIGH"
+TIDE_LOW = "LOW"
+TIDE_RISING = "rising"
+TIDE_FALLING = "falling"
+# The direction of the tide between two tides of these types
+TYPE_TRENDS = {(TIDE_LOW, TIDE_HIGH): TIDE_RISING, (TIDE_HIGH, TIDE_LOW): TIDE_FALLING}
+
+
+class TideTimeline:
+    """High and low tides sorted by time, answering "next tide" with a binary search.
+
+    The water level between two tides follows half a cosine from one height to
+    the other, so each stretch is precomputed as a start, duration and range.
+    """
+
+    __slots__ = ("events", "_times", "_by_type", "_segments")
+
+    def __init__(self, events: Iterable[TideEvent] = ()) -> None:
+        """Sort the events once."""
+        self.events: tuple[TideEvent, ...] = tuple(sorted(events, key=lambda event: event.time))
+        self._times = [event.time for event in self.events]
+        self._by_type: dict[str, tuple[list[datetime], list[TideEvent]]] = {}
+        for event in self.events:
+            times, events_of_type = self._by_type.setdefault(event.type, ([], []))
+            times.append(event.time)
+            events_of_type.append(event)
+        self._segments: list[tuple[float, float, float, float] | None] = []
+        for previous, following in zip(self.events, self.events[1:]):
+            start = previous.time.timestamp()
+            duration = following.time.timestamp() - start
+            if previous.height is None or following.height is None or duration <= 0:
+                self._segments.append(None)
+            else:
+                self._segments.append((start, duration, previous.height, following.height - previous.height))
+
+    def next_event(self, now: datetime, tide_type: str | None = None) -> TideEvent | None:
+        """Return the first tide after now, of a type if one is given."""
+        if tide_type is None:
+            times, events = self._times, self.events
+        elif (by_type := self._by_type.get(tide_type)) is None:
+            return None
+        else:
+            times, events = by_type
+        index = bisect_right(times, now)
+        return events[index] if index < len(events) else None
+
+    def next_time(self, now: datetime, tide_type: str | None = None) -> datetime | None:
+        """Return the time of the first tide after now, of a type if one is given."""
+        event = self.next_event(now, tide_type)
+        return event.time if event is not None else None
+
+    def _segment_at(self, now: datetime) -> tuple[float, float, float, float] | None:
+        """Return the stretch between the tides either side of now."""
+        index = bisect_right(self._times, now)
+        if index == 0 or index == len(self._times):
+            return None
+        return self._segments[index - 1]
+
+    def height_at(self, now: datetime) -> float | None:
+        """Return the interpolated water level at now, or None outside the tide table."""
+        if (segment := self._segment_at(now)) is None:
+            return None
+        start, duration, height, change = segment
+        progress = (now.timestamp() - start) / duration
+        return height + change * (1 - cos(pi * progress)) / 2
+
+    def trend_at(self, now: datetime) -> str | None:
+        """Return whether the tide is rising or falling at now.
+
+        Without heights to compare, the types of the tides either side of now
+        tell: the tide rises from a low to a high and falls from a high to a low.
+        """
+        index = bisect_right(self._times, now)
+        if index == 0 or index == len(self._times):
+            return None
+        if (segment := self._segments[index - 1]) is not None and segment[3] != 0:
+            return TIDE_RISING if segment[3] > 0 else TIDE_FALLING
+        return TYPE_TRENDS.get((self.events[index - 1].type, self.events[index].type))
+
+    def __len__(self) -> int:
+        """Return the number of tides."""
+        return len(self.events)
@@ -7,23 +7,20 @@ https://github.com/ciejer/metservice-weather.
 from . import WeatherUpdateCoordinator
 from homeassistant.config_entries import ConfigEntry
 from .const import (
+    ATTRIBUTE_MODE_FULL,
+    ATTRIBUTE_MODE_SUBSCRIPTION,
+    ATTRIBUTE_MODE_UNRECORDED,
+    CONF_ATTRIBUTE_MODE,
     DOMAIN,
-    FIELD_CONDITIONS,
-    FIELD_HUMIDITY,
-    FIELD_PRESSURE,
-    FIELD_TEMP,
-    FIELD_WINDDIR,
-    FIELD_WINDSPEED,
     LENGTHUNIT,
     MANUFACTURER,
     PRESSUREUNIT,
     SPEEDUNIT,
     TEMPUNIT,
-    CONDITION_MAP,
 )
+from .model import DailyForecast, HourlyPoint
 
 import logging
-from datetime import datetime
 
 from homeassistant.components.weather import (
     ATTR_FORECAST_PRECIPITATION,
@@ -39,7 +36,7 @@ from homeassistant.components.weather import (
     DOMAIN as WEATHER_DOMAIN,
 )
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import generate_entity_id
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -47,13 +44,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 _LOGGER = logging.getLogger(__name__)
 
 ENTITY_ID_FORMAT = WEATHER_DOMAIN + ".{}"
-
-def safe_float(value):
-    """Safely convert a value to float, return None if conversion fails."""
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None
+# The forecast lists are by far the largest attributes, rewritten on every update
+FORECAST_ATTRIBUTES = frozenset({"forecast_hourly", "forecast_daily"})
 
 
 async def async_setup_entry(
@@ -61,20 +53,78 @@ async def async_setup_entry(
 ) -> None:
     """Add weather entity."""
     coordinator: WeatherUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    attribute_mode = entry.options.get(CONF_ATTRIBUTE_MODE, ATTRIBUTE_MODE_FULL)
     if(entry.data["api"] == "mobile"):
         async_add_entities(
             [
-                MetServiceForecastMobile(coordinator),
+                FORECAST_ENTITIES_MOBILE[attribute_mode](coordinator),
             ]
         )
     else:
         async_add_entities(
             [
-                MetServiceForecastPublic(coordinator),
+                FORECAST_ENTITIES_PUBLIC[attribute_mode](coordinator),
             ]
         )
 
 
+def _hourly_forecast(point: HourlyPoint) -> Forecast:
+    """Return an hour of the snapshot as a Home Assistant forecast."""
+    return Forecast(
+        {
+            ATTR_FORECAST_TEMP: point.temperature,
+            ATTR_FORECAST_TIME: point.time,
+            ATTR_FORECAST_PRECIPITATION: point.precipitation,
+            ATTR_FORECAST_WIND_SPEED: point.wind_speed,
+            ATTR_FORECAST_WIND_BEARING: point.wind_bearing,
+            ATTR_FORECAST_CONDITION: point.condition,
+        }
+    )
+
+
+def _daily_forecast(day: DailyForecast) -> Forecast:
+    """Return a day of the snapshot as a Home Assistant forecast."""
+    return Forecast(
+        {
+            ATTR_FORECAST_TEMP: day.temp_high,
+            ATTR_FORECAST_TEMP_LOW: day.temp_low,
+            ATTR_FORECAST_CONDITION: day.condition,
+            ATTR_FORECAST_TIME: day.time,
+        }
+    )
+
+
+class ForecastCacheMixin:
+    """Build the forecast lists once per coordinator update.
+
+    They are read for the state attributes on every state write and again for
+    every forecast subscription, so each list is kept until the next update.
+    """
+
+    coordinator: WeatherUpdateCoordinator
+
+    def _init_forecast_cache(self) -> None:
+        """Start with no cached forecasts."""
+        self._forecast_cache: dict[str, tuple[int, list[Forecast]]] = {}
+        self.forecast_builds = 0
+
+    def _cached_forecast(self, kind: str, build) -> list[Forecast]:
+        """Return a forecast list, building it if this update has not yet."""
+        generation = self.coordinator.generation
+        cached = self._forecast_cache.get(kind)
+        if cached is None or cached[0] != generation:
+            self.forecast_builds += 1
+            _LOGGER.debug(f"Building {kind} forecast for update {generation} (build {self.forecast_builds})")
+            cached = self._forecast_cache[kind] = (generation, build())
+        return cached[1]
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop the forecasts of the previous update."""
+        self._forecast_cache.clear()
+        super()._handle_coordinator_update()
+
+
 class MetServiceMobile(SingleCoordinatorWeatherEntity):
     """Implementation of a MetService weather service."""
 
@@ -90,7 +140,7 @@ class MetServiceMobile(SingleCoordinatorWeatherEntity):
     @property
     def native_temperature(self) -> float:
         """Return the platform temperature in native units (i.e. not converted)."""
-        return self.coordinator.get_current_mobile(FIELD_TEMP)
+        return self.coordinator.weather.current.temperature
 
     @property
     def native_temperature_unit(self) -> str:
@@ -100,7 +150,7 @@ class MetServiceMobile(SingleCoordinatorWeatherEntity):
     @property
     def native_pressure(self) -> float:
         """Return the pressure in native units."""
-        return self.coordinator.get_current_public(FIELD_PRESSURE)
+        return self.coordinator.weather.current.pressure
 
     @property
     def native_pressure_unit(self) -> str:
@@ -110,12 +160,12 @@ class MetServiceMobile(SingleCoordinatorWeatherEntity):
     @property
     def humidity(self) -> float:
         """Return the relative humidity in native units."""
-        return self.coordinator.get_current_public(FIELD_HUMIDITY)
+        return self.coordinator.weather.current.humidity
 
     @property
     def native_wind_speed(self) -> float:
         """Return the wind speed in native units."""
-        return self.coordinator.get_current_mobile(FIELD_WINDSPEED)
+        return self.coordinator.weather.current.wind_speed
 
     @property
     def native_wind_speed_unit(self) -> str:
@@ -125,7 +175,7 @@ class MetServiceMobile(SingleCoordinatorWeatherEntity):
     @property
     def wind_bearing(self) -> str:
         """Return the wind bearing."""
-        return self.coordinator.get_current_mobile(FIELD_WINDDIR)
+        return self.coordinator.weather.current.wind_direction
 
     @property
     def native_precipitation_unit(self) -> str:
@@ -135,12 +185,10 @@ class MetServiceMobile(SingleCoordinatorWeatherEntity):
     @property
     def condition(self) -> str:
         """Return the current condition."""
-        if self.coordinator.get_current_mobile(FIELD_CONDITIONS) in CONDITION_MAP:
-            return CONDITION_MAP[self.coordinator.get_current_mobile(FIELD_CONDITIONS)]
-        return self.coordinator.get_current_mobile(FIELD_CONDITIONS)
+        return self.coordinator.weather.current.condition
 
 
-class MetServiceForecastMobile(MetServiceMobile):
+class MetServiceForecastMobile(ForecastCacheMixin, MetServiceMobile):
     """Implementation of a MetService weather forecast."""
 
     _attr_has_entity_name = True
@@ -152,6 +200,7 @@ class MetServiceForecastMobile(MetServiceMobile):
             ENTITY_ID_FORMAT, f"{coordinator.location_name}", hass=coordinator.hass
         )
         self._attr_unique_id = f"{coordinator.location_name},{WEATHER_DOMAIN}".lower()
+        self._init_forecast_cache()
 
     @property
     def supported_features(self) -> WeatherEntityFeature:
@@ -184,82 +233,16 @@ class MetServiceForecastMobile(MetServiceMobile):
     @property
     def forecast_hourly(self) -> list[Forecast]:
         """Return the hourly forecast in native units."""
-
-        forecast = []
-        hourly_readings = self.coordinator.get_current_mobile("hourly_base")
-        for hour in range(
-            0,
-            len(hourly_readings)-1,
-            1,
-        ):
-            this_hour = hourly_readings[hour]
-
-            icon = "sunny"
-            rain_fall = safe_float(this_hour.get("rainFall"))
-            wind_speed = safe_float(this_hour.get("windSpeed"))
-            wind_dir = this_hour.get("windDir")
-
-            if rain_fall is not None and rain_fall > 0:
-                # rainy
-                if rain_fall > 6:
-                    # pouring
-                    icon = "pouring"
-                else:
-                    icon = "rainy"
-            else:
-                # clear
-                if wind_speed is not None and wind_speed > 40:
-                    # windy
-                    icon = "windy"
-                if 7 < datetime.fromisoformat(this_hour["dateISO"]).hour < 19:
-                    # daytime
-                    icon = "partlycloudy"
-                else:
-                    # nighttime
-                    icon = "clear-night"
-
-            forecast.append(
-                Forecast(
-                    {
-                        ATTR_FORECAST_TEMP: safe_float(this_hour.get("temperature")),
-                        ATTR_FORECAST_TIME: self.coordinator._format_timestamp(
-                            this_hour["dateISO"]
-                        ),
-                        ATTR_FORECAST_PRECIPITATION: rain_fall,
-                        ATTR_FORECAST_WIND_SPEED: wind_speed,
-                        ATTR_FORECAST_WIND_BEARING: wind_dir,
-                        ATTR_FORECAST_CONDITION: icon,
-                    }
-                )
-            )
-        return forecast
+        return self._cached_forecast(
+            "hourly", lambda: [_hourly_forecast(point) for point in self.coordinator.weather.hourly]
+        )
 
     @property
     def forecast_daily(self) -> list[Forecast]:
         """Return the daily forecast in native units."""
-
-        forecast = []
-        num_days = self.coordinator.get_forecast_daily_mobile("", 0)
-
-        for day in range(0, num_days):
-            day_condition = self.coordinator.get_forecast_daily_mobile("daily_condition", day)
-            if day_condition in CONDITION_MAP:
-                day_condition = CONDITION_MAP[day_condition]
-            forecast.append(
-                Forecast(
-                    {
-                        ATTR_FORECAST_TEMP: self.coordinator.get_forecast_daily_mobile(
-                            "daily_temp_high", day
-                        ),
-                        ATTR_FORECAST_TEMP_LOW: self.coordinator.get_forecast_daily_mobile(
-                            "daily_temp_low", day
-                        ),
-                        ATTR_FORECAST_CONDITION: day_condition,
-                        ATTR_FORECAST_TIME: self.coordinator.get_forecast_daily_mobile("daily_datetime", day),
-                    }
-                )
-            )
-        return forecast
+        return self._cached_forecast(
+            "daily", lambda: [_daily_forecast(day) for day in self.coordinator.weather.daily]
+        )
 
 class MetServicePublic(SingleCoordinatorWeatherEntity):
     """Implementation of a MetService weather service."""
@@ -276,7 +259,7 @@ class MetServicePublic(SingleCoordinatorWeatherEntity):
     @property
     def native_temperature(self) -> float:
         """Return the platform temperature in native units (i.e. not converted)."""
-        return self.coordinator.get_current_public(FIELD_TEMP)
+        return self.coordinator.weather.current.temperature
 
     @property
     def native_temperature_unit(self) -> str:
@@ -286,7 +269,7 @@ class MetServicePublic(SingleCoordinatorWeatherEntity):
     @property
     def native_pressure(self) -> float:
         """Return the pressure in native units."""
-        return self.coordinator.get_current_public(FIELD_PRESSURE)
+        return self.coordinator.weather.current.pressure
 
     @property
     def native_pressure_unit(self) -> str:
@@ -296,13 +279,13 @@ class MetServicePublic(SingleCoordinatorWeatherEntity):
     @property
     def humidity(self) -> float:
         """Return the relative humidity in native units."""
-        humidity = self.coordinator.get_current_public(FIELD_HUMIDITY)
+        humidity = self.coordinator.weather.current.humidity
         return int(humidity) if humidity is not None else None
 
     @property
     def native_wind_speed(self) -> float:
         """Return the wind speed in native units."""
-        return self.coordinator.get_current_public(FIELD_WINDSPEED)
+        return self.coordinator.weather.current.wind_speed
 
     @property
     def native_wind_speed_unit(self) -> str:
@@ -312,7 +295,7 @@ class MetServicePublic(SingleCoordinatorWeatherEntity):
     @property
     def wind_bearing(self) -> str:
         """Return the wind bearing."""
-        return self.coordinator.get_current_public(FIELD_WINDDIR)
+        return self.coordinator.weather.current.wind_direction
 
     @property
     def native_precipitation_unit(self) -> str:
@@ -322,12 +305,10 @@ class MetServicePublic(SingleCoordinatorWeatherEntity):
     @property
     def condition(self) -> str:
         """Return the current condition."""
-        if self.coordinator.get_current_public(FIELD_CONDITIONS) in CONDITION_MAP:
-            return CONDITION_MAP[self.coordinator.get_current_public(FIELD_CONDITIONS)]
-        return self.coordinator.get_current_public(FIELD_CONDITIONS)
+        return self.coordinator.weather.current.condition
 
 
-class MetServiceForecastPublic(MetServicePublic):
+class MetServiceForecastPublic(ForecastCacheMixin, MetServicePublic):
     """Implementation of a MetService weather forecast."""
 
     _attr_has_entity_name = True
@@ -339,6 +320,7 @@ class MetServiceForecastPublic(MetServicePublic):
             ENTITY_ID_FORMAT, f"{coordinator.location_name}", hass=coordinator.hass
         )
         self._attr_unique_id = f"{coordinator.location_name},{WEATHER_DOMAIN}".lower()
+        self._init_forecast_cache()
 
     @property
     def supported_features(self) -> WeatherEntityFeature:
@@ -372,97 +354,57 @@ class MetServiceForecastPublic(MetServicePublic):
     @property
     def forecast_hourly(self) -> list[Forecast]:
         """Return the hourly forecast in native units."""
-
-        forecast = []
-        hourly_readings = self.coordinator.get_current_public("hourly_temp")
-        hourly_obs = self.coordinator.get_current_public("hourly_obs")
-        hourly_skip = self.coordinator.get_current_public("hourly_skip")
-        # print(hourly_readings , hourly_obs, hourly_skip)
-        if hourly_obs is None: #Handles regions which do not have daily data
-            hourly_obs = self.coordinator.get_current_public("hourly_bkp_obs")
-
-        if hourly_skip is None:
-            hourly_skip = self.coordinator.get_current_public("hourly_bkp_skip")
-
-        if hourly_readings is None:
-            hourly_readings = self.coordinator.get_current_public("hourly_bkp_temp")
-        # print(hourly_readings , hourly_obs, hourly_skip)
-
-        for hour in range(
-            hourly_skip,
-            hourly_obs + hourly_skip,
-            1,
-        ):
-            this_hour = hourly_readings[hour]
-
-            icon = "sunny"
-            rainfall = safe_float(this_hour.get("rainfall"))
-            wind_speed = safe_float(this_hour["wind"].get("speed"))
-            wind_dir = this_hour["wind"].get("direction")
-
-            if rainfall is not None and rainfall > 0:
-                # rainy
-                if rainfall > 6:
-                    # pouring
-                    icon = "pouring"
-                else:
-                    icon = "rainy"
-            else:
-                # clear
-                if wind_speed is not None and wind_speed > 40:
-                    # windy
-                    icon = "windy"
-                if 7 < datetime.fromisoformat(this_hour["date"]).hour < 19:
-                    # daytime
-                    icon = "partlycloudy"
-                else:
-                    # nighttime
-                    icon = "clear-night"
-
-            forecast.append(
-                Forecast(
-                    {
-                        ATTR_FORECAST_TEMP: safe_float(this_hour.get("temperature")),
-                        ATTR_FORECAST_TIME: self.coordinator._format_timestamp(
-                            this_hour["date"]
-                        ),
-                        ATTR_FORECAST_PRECIPITATION: rainfall,
-                        ATTR_FORECAST_WIND_SPEED: wind_speed,
-                        ATTR_FORECAST_WIND_BEARING: wind_dir,
-                        ATTR_FORECAST_CONDITION: icon,
-                    }
-                )
-            )
-        return forecast
+        return self._cached_forecast(
+            "hourly", lambda: [_hourly_forecast(point) for point in self.coordinator.weather.hourly]
+        )
 
     @property
     def forecast_daily(self) -> list[Forecast]:
         """Return the daily forecast in native units."""
+        return self._cached_forecast(
+            "daily", lambda: [_daily_forecast(day) for day in self.coordinator.weather.daily]
+        )
+
+
+class UnrecordedForecastMixin:
+    """Keep the forecast attributes out of the recorder."""
+
+    _unrecorded_attributes = FORECAST_ATTRIBUTES
+
+
+class SubscriptionForecastMixin:
+    """Leave the forecasts to the forecast subscription, without state attributes."""
+
+    @property
+    def extra_state_attributes(self) -> None:
+        """Return no state attributes."""
+        return None
+
+
+class MetServiceForecastMobileUnrecorded(UnrecordedForecastMixin, MetServiceForecastMobile):
+    """MetService mobile forecast whose forecast attributes are not recorded."""
+
+
+class MetServiceForecastMobileSubscription(SubscriptionForecastMixin, MetServiceForecastMobile):
+    """MetService mobile forecast served only through the forecast subscription."""
+
+
+class MetServiceForecastPublicUnrecorded(UnrecordedForecastMixin, MetServiceForecastPublic):
+    """MetService public forecast whose forecast attributes are not recorded."""
+
+
+class MetServiceForecastPublicSubscription(SubscriptionForecastMixin, MetServiceForecastPublic):
+    """MetService public forecast served only through the forecast subscription."""
 
-        forecast = []
-        num_days = self.coordinator.get_forecast_daily_public("", 0)
-        for day in range(0, num_days):
-            day_condition = self.coordinator.get_forecast_daily_public("daily_condition", day)
-            daily_temp_high = self.coordinator.get_forecast_daily_public("daily_temp_high", day)
-            daily_temp_low = self.coordinator.get_forecast_daily_public("daily_temp_low", day)
-            daily_datetime = self.coordinator.get_forecast_daily_public("daily_datetime", day)
-            if daily_temp_high is None: #Rural areas have data in a different location
-                daily_temp_high = self.coordinator.get_forecast_daily_public("daily_bkp_temp_high", day)
-            if daily_temp_low is None:
-                daily_temp_low = self.coordinator.get_forecast_daily_public("daily_bkp_temp_low", day)
-            if daily_datetime is None:
-                daily_datetime = self.coordinator.get_forecast_daily_public("daily_bkp_datetime", day)
-            if day_condition in CONDITION_MAP:
-                day_condition = CONDITION_MAP[day_condition]
-            forecast.append(
-                Forecast(
-                    {
-                        ATTR_FORECAST_TEMP: daily_temp_high,
-                        ATTR_FORECAST_TEMP_LOW: daily_temp_low,
-                        ATTR_FORECAST_CONDITION: day_condition,
-                        ATTR_FORECAST_TIME: daily_datetime,
-                    }
-                )
-            )
-        return forecast
 
+# Recorder exclusions are class attributes, so each attribute mode has its own entity class
+FORECAST_ENTITIES_MOBILE: dict[str, type[MetServiceForecastMobile]] = {
+    ATTRIBUTE_MODE_FULL: MetServiceForecastMobile,
+    ATTRIBUTE_MODE_UNRECORDED: MetServiceForecastMobileUnrecorded,
+    ATTRIBUTE_MODE_SUBSCRIPTION: MetServiceForecastMobileSubscription,
+}
+FORECAST_ENTITIES_PUBLIC: dict[str, type[MetServiceForecastPublic]] = {
+    ATTRIBUTE_MODE_FULL: MetServiceForecastPublic,
+    ATTRIBUTE_MODE_UNRECORDED: MetServiceForecastPublicUnrecorded,
+    ATTRIBUTE_MODE_SUBSCRIPTION: MetServiceForecastPublicSubscription,
+}
@@ -19,6 +19,7 @@ from .const import (
     ICON_THERMOMETER,
     ICON_WIND,
 )
+from .tides import TIDE_FALLING, TIDE_HIGH, TIDE_LOW, TIDE_RISING, TideTimeline
 from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorDeviceClass,
@@ -26,12 +27,24 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.const import (
     PERCENTAGE,
+    UnitOfLength,
     UnitOfTemperature,
     UnitOfPressure,
     UnitOfSpeed,
 )
 from homeassistant.helpers.typing import StateType
-AUCKLAND_TIMEZONE = dt_util.get_time_zone("Pacific/Auckland")
+
+
+def _next_tide(tides: TideTimeline, tide_type: str) -> datetime.datetime | None:
+    """Return the time of the next tide of a type, or None."""
+    return tides.next_time(dt_util.utcnow(), tide_type)
+
+
+def _tide_height(tides: TideTimeline) -> float | None:
+    """Return the current interpolated tide height, or None."""
+    height = tides.height_at(dt_util.utcnow())
+    return round(height, 2) if height is not None else None
+
 
 @dataclass
 class WeatherRequiredKeysMixin:
@@ -201,19 +214,7 @@ current_condition_sensor_descriptions_public = [
         name="Next High Tide",
         icon="mdi:beach",
         device_class=SensorDeviceClass.TIMESTAMP,
-        value_fn=lambda data, _: (
-            [
-                dt_util.parse_datetime(a["time"])
-                for a in data
-                if a["type"] == "HIGH"
-                and dt_util.parse_datetime(a["time"]) is not None
-                and dt_util.parse_datetime(a["time"]) > dt_util.now(AUCKLAND_TIMEZONE)
-            ][0]
-            if data
-            else None
-        )
-        if isinstance(data, list)
-        else None,
+        value_fn=lambda data, _: _next_tide(data, TIDE_HIGH),
 
     ),
 
@@ -222,19 +223,24 @@ current_condition_sensor_descriptions_public = [
         name="Next Low Tide",
         icon="mdi:beach",
         device_class=SensorDeviceClass.TIMESTAMP,
-        value_fn=lambda data, _: (
-            [
-                dt_util.parse_datetime(a["time"])
-                for a in data
-                if a["type"] == "LOW"
-                and dt_util.parse_datetime(a["time"]) is not None
-                and dt_util.parse_datetime(a["time"]) > dt_util.now(AUCKLAND_TIMEZONE)
-            ][0]
-            if data
-            else None
-        )
-        if isinstance(data, list)
-        else None,
+        value_fn=lambda data, _: _next_tide(data, TIDE_LOW),
+    ),
+    WeatherSensorEntityDescription(
+        key="tide_height",
+        name="Tide Height",
+        icon="mdi:waves",
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        unit_fn=lambda _: UnitOfLength.METERS,
+        value_fn=lambda data, _: _tide_height(data),
+    ),
+    WeatherSensorEntityDescription(
+        key="tide_trend",
+        name="Tide Rising or Falling",
+        icon="mdi:waves-arrow-up",
+        device_class=SensorDeviceClass.ENUM,
+        options=[TIDE_RISING, TIDE_FALLING],
+        value_fn=lambda data, _: data.trend_at(dt_util.utcnow()),
     ),
 ]
 
@@ -389,19 +395,7 @@ current_condition_sensor_descriptions_mobile = [
         name="Next High Tide",
         icon="mdi:beach",
         device_class=SensorDeviceClass.TIMESTAMP,
-        value_fn=lambda data, _: (
-            [
-                dt_util.parse_datetime(a["time"])
-                for a in data
-                if a["type"] == "HIGH"
-                and dt_util.parse_datetime(a["time"]) is not None
-                and dt_util.parse_datetime(a["time"]) > dt_util.now(AUCKLAND_TIMEZONE)
-            ][0]
-            if data
-            else None
-        )
-        if isinstance(data, list)
-        else None,
+        value_fn=lambda data, _: _next_tide(data, TIDE_HIGH),
     ),
     WeatherSensorEntityDescription(
         key="tides_low",
@@ -409,18 +403,23 @@ current_condition_sensor_descriptions_mobile = [
         icon="mdi:beach",
         device_class=SensorDeviceClass.TIMESTAMP,
 
-        value_fn=lambda data, _: (
-            [
-                dt_util.parse_datetime(a["time"])
-                for a in data
-                if a["type"] == "LOW"
-                and dt_util.parse_datetime(a["time"]) is not None
-                and dt_util.parse_datetime(a["time"]) > dt_util.now(AUCKLAND_TIMEZONE)
-            ][0]
-            if data
-            else None
-        )
-        if isinstance(data, list)
-        else None,
+        value_fn=lambda data, _: _next_tide(data, TIDE_LOW),
+    ),
+    WeatherSensorEntityDescription(
+        key="tide_height",
+        name="Tide Height",
+        icon="mdi:waves",
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        unit_fn=lambda _: UnitOfLength.METERS,
+        value_fn=lambda data, _: _tide_height(data),
+    ),
+    WeatherSensorEntityDescription(
+        key="tide_trend",
+        name="Tide Rising or Falling",
+        icon="mdi:waves-arrow-up",
+        device_class=SensorDeviceClass.ENUM,
+        options=[TIDE_RISING, TIDE_FALLING],
+        value_fn=lambda data, _: data.trend_at(dt_util.utcnow()),
     ),
 ]
@@ -0,0 +1,6 @@
+"""Make the integration importable when the tests are run from anywhere."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
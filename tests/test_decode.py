@@ -0,0 +1,76 @@
+"""Check the streamed tide table extraction against decoding the whole body."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import orjson
+import pytest
+
+from custom_components.metservice_weather.decode import JsonDecoder
+
+TIDES = [
+    {"time": "2024-03-10T03:00:00+13:00", "type": "HIGH", "height": 2.1, "note": "]}[{ brackets"},
+    {"time": "2024-03-10T09:00:00+13:00", "type": "LOW", "height": 0.4, "note": 'a \\"quoted\\" [word]\\\\'},
+]
+BODY = orjson.dumps(
+    {
+        "location": {"label": "tideData", "text": 'the "tideData": ["not it"]'},
+        "layout": {"primary": {"slots": {"main": {"modules": [{"tideData": TIDES, "after": list(range(100))}]}}}},
+    }
+)
+
+
+async def _chunks(body: bytes, size: int) -> AsyncIterator[bytes]:
+    """Yield the body in chunks of a size."""
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def extract(body: bytes, size: int, key: str = "tideData") -> Any:
+    """Return what extract finds under key in a body streamed in chunks of a size."""
+    return asyncio.run(JsonDecoder(None).extract(_chunks(body, size), key, "tides_stream"))
+
+
+def expected(body: bytes) -> Any:
+    """Return the tide table of a body decoded in full."""
+    return orjson.loads(body)["layout"]["primary"]["slots"]["main"]["modules"][0]["tideData"]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, len(BODY)])
+def test_extract_matches_full_decode(size: int) -> None:
+    """Brackets and escaped quotes in strings, and the key as a string value, do not fool the scanner."""
+    assert extract(BODY, size) == expected(BODY) == TIDES
+
+
+def test_extract_key_split_across_chunks() -> None:
+    """A key cut anywhere by a chunk boundary is still found."""
+    key_at = BODY.index(b'"tideData":')
+    for cut in range(key_at, key_at + len(b'"tideData": [')):
+        chunks = [BODY[:cut], BODY[cut:]]
+
+        async def split() -> AsyncIterator[bytes]:
+            for chunk in chunks:
+                yield chunk
+
+        found = asyncio.run(JsonDecoder(None).extract(split(), "tideData", "tides_stream"))
+        assert found == expected(BODY), cut
+
+
+def test_extract_missing_key() -> None:
+    """A document without the key gives None."""
+    body = orjson.dumps({"layout": {"primary": {}}, "text": "tideData"})
+    assert extract(body, 5) is None
+
+
+def test_extract_value_not_a_container() -> None:
+    """A key holding a scalar gives None."""
+    assert extract(orjson.dumps({"tideData": "none today"}), 4) is None
+
+
+def test_extract_truncated_body() -> None:
+    """A body that ends inside the value gives None rather than a partial table."""
+    end = BODY.index(b'"after"')
+    assert extract(BODY[:end - 20], 8) is None
@@ -0,0 +1,147 @@
+"""Check the compiled path lookups against the recursive lookup they replaced.
+
+The per-update key index and payload pruning are checked against it too.
+Run `python -m tests.test_paths` from the repository root to compare their speed.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Any
+
+import pytest
+
+from custom_components.metservice_weather.const import SENSOR_MAP_MOBILE, SENSOR_MAP_PUBLIC
+from custom_components.metservice_weather.paths import PathAccessor, PayloadIndex, compile_path, prune
+
+KEYS = ("a", "b", "c", "0", "1", "temperature", "days")
+PATHS = ("a", "b.c", "a.b", "a.0", "days.1.a", "0.a", "temperature", "c.a.b", "b.1", "days.0.temperature.c")
+SEEDS = range(2000)
+
+
+def get_from_dict(data_dict: Any, map_list: list[str]) -> Any:
+    """Recursively look for a given key path within a dictionary, as the coordinator used to."""
+    if not map_list:
+        return data_dict
+    if isinstance(data_dict, list):
+        for idx, item in enumerate(data_dict):
+            if map_list[0].isdigit() and idx == int(map_list[0]):
+                result = get_from_dict(item, map_list[1:])
+                if result is not None:
+                    return result
+            else:
+                result = get_from_dict(item, map_list)
+                if result is not None:
+                    return result
+    elif isinstance(data_dict, dict):
+        for key, value in data_dict.items():
+            if key == map_list[0]:
+                result = get_from_dict(value, map_list[1:])
+                if result is not None:
+                    return result
+            else:
+                result = get_from_dict(value, map_list)
+                if result is not None:
+                    return result
+    return None
+
+
+def random_payload(rng: random.Random, depth: int = 0) -> Any:
+    """Return a small nested payload that reuses a few keys, so paths often match more than once."""
+    roll = rng.random()
+    if depth >= 4 or roll < 0.3:
+        return rng.choice([None, 0, 1, "x", 2.5, True])
+    if roll < 0.65:
+        return {key: random_payload(rng, depth + 1) for key in rng.sample(KEYS, rng.randint(0, 4))}
+    return [random_payload(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+
+
+def fixture_payload() -> dict[str, Any]:
+    """Return a payload shaped like the public current conditions page."""
+    return {
+        "location": {"key": "tauranga", "type": "towns-cities"},
+        "layout": {
+            "primary": {
+                "slots": {
+                    "main": {
+                        "modules": [
+                            {
+                                "observations": {
+                                    "temperature": [{"current": 17, "feelsLike": 15}],
+                                    "wind": [{"averageSpeed": 20, "gustSpeed": 35, "direction": "SW"}],
+                                    "rain": [{"relativeHumidity": 70}],
+                                    "pressure": [{"atSeaLevel": 1012, "trend": "falling"}],
+                                },
+                            },
+                            {
+                                "days": [
+                                    {"forecastWord": "fine", "forecast": f"Day {day}.", "max": 20 + day, "min": 9}
+                                    for day in range(10)
+                                ],
+                            },
+                        ]
+                    }
+                }
+            }
+        },
+        "result": {"observationData": {"temperature": 17, "humidity": 70}},
+    }
+
+
+def test_accessor_matches_get_from_dict() -> None:
+    """PathAccessor, PayloadIndex.find and prune all agree with the old lookup on random payloads."""
+    accessors = [PathAccessor(path) for path in PATHS]
+    for seed in SEEDS:
+        data = random_payload(random.Random(seed))
+        index = PayloadIndex(data)
+        pruned = prune(data, accessors)
+        for accessor in accessors:
+            expected = get_from_dict(data, accessor.path.split("."))
+            assert accessor.get(data) == expected, (seed, accessor)
+            assert index.find(accessor) == expected, (seed, accessor)
+            assert accessor.get(pruned) == expected, (seed, accessor)
+
+
+@pytest.mark.parametrize("path", sorted({*SENSOR_MAP_PUBLIC.values(), *SENSOR_MAP_MOBILE.values()}))
+def test_sensor_map_paths_on_fixture(path: str) -> None:
+    """Every SENSOR_MAP path finds the same value on a realistic payload."""
+    data = fixture_payload()
+    accessor = compile_path(path)
+    expected = get_from_dict(data, path.split("."))
+    assert accessor.get(data) == expected
+    assert PayloadIndex(data).find(accessor) == expected
+    assert accessor.get(prune(data, [accessor])) == expected
+
+
+def test_prune_keeps_paths_whole() -> None:
+    """Nodes kept by path are shared with the payload, and everything else is dropped."""
+    data = fixture_payload()
+    days_path = ("layout", "primary", "slots", "main", "modules", 1, "days")
+    pruned = prune(data, keep=[days_path])
+    days = pruned["layout"]["primary"]["slots"]["main"]["modules"][1]["days"]
+    assert days is data["layout"]["primary"]["slots"]["main"]["modules"][1]["days"]
+    assert pruned["layout"]["primary"]["slots"]["main"]["modules"][0] is None
+    assert "result" not in pruned and "location" not in pruned
+
+
+def benchmark(rounds: int = 200) -> None:
+    """Print how long a pass over every SENSOR_MAP path takes with each lookup."""
+    data = fixture_payload()
+    paths = [*SENSOR_MAP_PUBLIC.values(), *SENSOR_MAP_MOBILE.values()]
+    accessors = [compile_path(path) for path in paths]
+    runs = {
+        "get_from_dict": lambda: [get_from_dict(data, path.split(".")) for path in paths],
+        "PathAccessor.get": lambda: [accessor.get(data) for accessor in accessors],
+        "PayloadIndex.find": lambda: [index.find(accessor) for accessor in accessors],
+    }
+    index = PayloadIndex(data)
+    for name, run in runs.items():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            run()
+        print(f"{name}: {(time.perf_counter() - start) / rounds * 1000:.3f} ms per pass")  # noqa: T201
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,73 @@
+"""Check the request budget shared by the entries using one API key."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.metservice_weather.ratelimit import BudgetExhaustedError, TokenBucket
+
+
+class Clock:
+    """A clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the time."""
+        return self.now
+
+
+def test_full_bucket_then_refused() -> None:
+    """A full bucket grants its capacity at once, then refuses a request too far off."""
+    bucket = TokenBucket(capacity=3, refill_per_hour=60, clock=Clock())
+
+    async def run() -> None:
+        for _ in range(3):
+            await bucket.acquire()
+        with pytest.raises(BudgetExhaustedError):
+            await bucket.acquire()
+
+    asyncio.run(run())
+    assert bucket.as_dict() == {
+        "remaining": 0.0,
+        "capacity": 3,
+        "refill_per_hour": 60.0,
+        "granted": 3,
+        "waited": 0,
+        "rejected": 1,
+    }
+
+
+def test_refill_is_capped_at_capacity() -> None:
+    """Tokens come back at the refill rate, up to the capacity."""
+    clock = Clock()
+    bucket = TokenBucket(capacity=3, refill_per_hour=60, clock=clock)
+
+    async def run() -> None:
+        for _ in range(3):
+            await bucket.acquire()
+
+    asyncio.run(run())
+    clock.now += 90
+    assert bucket.tokens == pytest.approx(1.5)
+    clock.now += 3600
+    assert bucket.tokens == 3
+
+
+def test_waits_for_a_token_due_soon() -> None:
+    """A request waits for a token due within max_wait instead of being refused."""
+    bucket = TokenBucket(capacity=1, refill_per_hour=3600 * 100, clock=Clock())
+
+    async def run() -> None:
+        await bucket.acquire()
+        await bucket.acquire(max_wait=1)
+        with pytest.raises(BudgetExhaustedError):
+            await bucket.acquire(max_wait=0.001)
+
+    asyncio.run(run())
+    assert bucket.as_dict()["waited"] == 1
+    assert bucket.as_dict()["rejected"] == 1
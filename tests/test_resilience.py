@@ -0,0 +1,102 @@
+"""Check the circuit breaker and the retry loop around it."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.metservice_weather.resilience import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retry,
+)
+
+COOLDOWN = 60.0
+
+
+class Clock:
+    """A clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the time."""
+        return self.now
+
+
+def half_open_breaker(clock: Clock) -> CircuitBreaker:
+    """Return a breaker opened by failures whose cooldown has just passed."""
+    breaker = CircuitBreaker(threshold=2, cooldown=COOLDOWN, clock=clock)
+    for _ in range(2):
+        breaker.record_failure(TimeoutError())
+    assert breaker.state == BREAKER_OPEN
+    clock.now += COOLDOWN
+    assert breaker.state == BREAKER_HALF_OPEN
+    return breaker
+
+
+def test_half_open_lets_one_trial_through() -> None:
+    """Only one request goes through a half-open breaker, and its success closes it."""
+    breaker = half_open_breaker(Clock())
+    assert breaker.before_request() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.before_request() is False
+
+
+def test_failed_trial_reopens() -> None:
+    """A failed trial holds requests back for another cooldown."""
+    breaker = half_open_breaker(Clock())
+    breaker.before_request()
+    breaker.record_failure(TimeoutError())
+    assert breaker.state == BREAKER_OPEN
+
+
+def test_cancelling_another_request_keeps_the_trial() -> None:
+    """Only cancelling the trial request lets another one be the trial."""
+    clock = Clock()
+    breaker = CircuitBreaker(threshold=2, cooldown=COOLDOWN, clock=clock)
+    policy = RetryPolicy(attempts=1)
+
+    async def run() -> None:
+        trial_started = asyncio.Event()
+        other_started = asyncio.Event()
+
+        async def trial_attempt() -> None:
+            trial_started.set()
+            await asyncio.sleep(3600)
+
+        async def other_attempt() -> None:
+            other_started.set()
+            await asyncio.sleep(3600)
+
+        # Started while closed, still waiting for its answer when the breaker opens
+        other = asyncio.create_task(call_with_retry(policy, breaker, other_attempt))
+        await other_started.wait()
+        for _ in range(2):
+            breaker.record_failure(TimeoutError())
+        clock.now += COOLDOWN
+        trial = asyncio.create_task(call_with_retry(policy, breaker, trial_attempt))
+        await trial_started.wait()
+
+        other.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await other
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        assert breaker.before_request() is True
+
+    asyncio.run(run())
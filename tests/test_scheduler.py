@@ -0,0 +1,224 @@
+"""Check the refresh scheduling around learned MetService issue times."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.metservice_weather.const import FEED_FORECAST, FEED_OBSERVATIONS, FEED_WARNINGS
+from custom_components.metservice_weather.coordinator import (
+    FEED_MAX_STALENESS,
+    FEED_REFRESH_INTERVALS,
+    WeatherUpdateCoordinator,
+    WeatherUpdateCoordinatorConfig,
+)
+from custom_components.metservice_weather.scheduler import (
+    FAILED_FEED_RETRY,
+    FEED_POLL_BOUNDS,
+    LATE_ISSUE_RETRY,
+    PUBLICATION_DELAY,
+    WARNING_ACTIVE_INTERVAL,
+    STARTUP_PRIORITY_NO_SNAPSHOT,
+    STARTUP_PRIORITY_RESTORED,
+    IssueCadence,
+    RefreshScheduler,
+    StartupQueue,
+)
+
+START = datetime(2024, 3, 10, 0, 5, tzinfo=timezone.utc)
+HOUR = timedelta(hours=1)
+
+
+def hourly_scheduler(issues: int = 3) -> RefreshScheduler:
+    """Return a scheduler that has seen observations issued on the hour."""
+    scheduler = RefreshScheduler(FEED_REFRESH_INTERVALS)
+    for issue in range(issues):
+        scheduler.record_issue(FEED_OBSERVATIONS, START + HOUR * issue)
+    return scheduler
+
+
+def test_cadence_learned_from_issues() -> None:
+    """The cadence is the median gap between issues, once enough have been seen."""
+    cadence = IssueCadence()
+    assert cadence.record_issue(START)
+    assert cadence.record_issue(START + HOUR)
+    assert cadence.interval is None
+    assert cadence.record_issue(START + HOUR * 2)
+    assert not cadence.record_issue(START + HOUR)
+    assert cadence.interval == HOUR
+    assert cadence.next_issue(START + HOUR * 2) == START + HOUR * 3
+    # Issues missed since the last one seen are skipped over
+    assert cadence.next_issue(START + HOUR * 4 + timedelta(minutes=1)) == START + HOUR * 5
+
+
+def test_fixed_interval_until_the_cadence_is_known() -> None:
+    """Too few issues leave a feed on its fixed interval."""
+    scheduler = hourly_scheduler(issues=2)
+    fetched_at = START + HOUR + timedelta(minutes=1)
+    assert scheduler.due_at(FEED_OBSERVATIONS, fetched_at, False) == fetched_at + FEED_REFRESH_INTERVALS[
+        FEED_OBSERVATIONS
+    ]
+
+
+def test_polled_after_the_expected_issue() -> None:
+    """A fetch well before the next issue is due just after it comes out."""
+    scheduler = hourly_scheduler()
+    fetched_at = START + HOUR * 2 + timedelta(minutes=30)
+    assert scheduler.due_at(FEED_OBSERVATIONS, fetched_at, False) == START + HOUR * 3 + PUBLICATION_DELAY
+
+
+def test_poll_clamped_to_the_bounds() -> None:
+    """Polls are never further apart than the longest or closer than the shortest bound."""
+    shortest, longest = FEED_POLL_BOUNDS[FEED_OBSERVATIONS]
+    scheduler = hourly_scheduler()
+    fetched_at = START + HOUR * 2 + timedelta(seconds=30)
+    assert scheduler.due_at(FEED_OBSERVATIONS, fetched_at, False) == fetched_at + longest
+    fast = RefreshScheduler(FEED_REFRESH_INTERVALS)
+    for issue in range(3):
+        fast.record_issue(FEED_OBSERVATIONS, START + timedelta(minutes=issue))
+    fetched_at = START + timedelta(minutes=2, seconds=10)
+    assert fast.due_at(FEED_OBSERVATIONS, fetched_at, False) == fetched_at + shortest
+
+
+def test_late_issue_backs_off() -> None:
+    """Polls for a late issue wait longer each time it still has not come out."""
+    scheduler = hourly_scheduler()
+    expected = START + HOUR * 3
+    for late_polls, wait in ((1, LATE_ISSUE_RETRY), (2, LATE_ISSUE_RETRY * 2), (3, LATE_ISSUE_RETRY * 4)):
+        polled_at = expected + PUBLICATION_DELAY + LATE_ISSUE_RETRY * late_polls
+        scheduler.record_poll(FEED_OBSERVATIONS, polled_at, False)
+        assert scheduler.due_at(FEED_OBSERVATIONS, polled_at, False) == polled_at + wait
+    # The issue coming out resets the backoff
+    scheduler.record_issue(FEED_OBSERVATIONS, expected + timedelta(minutes=20))
+    assert scheduler.cadence_info(FEED_OBSERVATIONS)["late_polls"] == 0
+
+
+def test_issued_elsewhere_waits_the_longest_poll() -> None:
+    """A forecast found unchanged is not polled for, as its issue shows in the observations."""
+    scheduler = RefreshScheduler(FEED_REFRESH_INTERVALS)
+    for issue in range(3):
+        scheduler.record_issue(FEED_FORECAST, START + HOUR * 6 * issue)
+    fetched_at = START + HOUR * 18 + timedelta(minutes=10)
+    assert scheduler.due_at(FEED_FORECAST, fetched_at, False) == fetched_at + FEED_POLL_BOUNDS[FEED_FORECAST][1]
+
+
+def test_warnings_shorten_the_interval() -> None:
+    """The observations and warnings are polled more often while a warning is in force."""
+    scheduler = hourly_scheduler()
+    fetched_at = START + HOUR * 2 + timedelta(minutes=30)
+    for feed in (FEED_OBSERVATIONS, FEED_WARNINGS):
+        assert scheduler.due_at(feed, fetched_at, True) == fetched_at + WARNING_ACTIVE_INTERVAL
+
+
+def test_one_failed_poll_at_the_longest_interval_keeps_the_data() -> None:
+    """A failed poll after the longest wait falls back on the last good observations."""
+
+    async def run() -> None:
+        hass = HomeAssistant("/tmp")
+        config = WeatherUpdateCoordinatorConfig(
+            api_url="https://api.example", warnings_url="", api_key="", api_type="mobile", unit_system_api="m",
+            unit_system="metric", location="Home", location_name="Home", latitude="1", longitude="2",
+            enable_tides=False, tide_url="",
+        )
+        coordinator = WeatherUpdateCoordinator(hass, config)
+        fetched_at = START + HOUR * 2 + timedelta(seconds=30)
+        for issue in range(3):
+            coordinator._scheduler.record_issue(FEED_OBSERVATIONS, START + HOUR * issue)
+        coordinator._store_feed(FEED_OBSERVATIONS, {"observations": True}, fetched_at)
+        now = coordinator._feed_due_at(FEED_OBSERVATIONS, coordinator._feeds[FEED_OBSERVATIONS])
+        assert now == fetched_at + FEED_POLL_BOUNDS[FEED_OBSERVATIONS][1]
+
+        async def failing() -> None:
+            raise TimeoutError
+
+        # Polled a moment late, as the coordinator fires after the feed falls due
+        await coordinator._refresh_feeds((FEED_OBSERVATIONS,), failing(), now + timedelta(seconds=5))
+        state = coordinator._feeds[FEED_OBSERVATIONS]
+        assert state.status == "stale"
+        assert state.data == {"observations": True}
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("feed", [FEED_OBSERVATIONS, FEED_FORECAST])
+def test_staleness_outlasts_the_longest_poll(feed: str) -> None:
+    """Each required feed can fail its longest poll and a retry before it is too old."""
+    assert FEED_MAX_STALENESS[feed] > FEED_POLL_BOUNDS[feed][1] + FAILED_FEED_RETRY
+
+
+async def _queue_turns(
+    queue: StartupQueue, entries: list[tuple[str, int]], admitted: list[str], finish: dict[str, asyncio.Event]
+) -> list[asyncio.Task]:
+    """Start a first refresh per entry, each holding its turn until told to finish."""
+
+    async def refresh(entry_id: str, priority: int) -> None:
+        async with queue.admit(entry_id, priority):
+            admitted.append(entry_id)
+            await finish[entry_id].wait()
+
+    tasks = []
+    for entry_id, priority in entries:
+        finish[entry_id] = asyncio.Event()
+        tasks.append(asyncio.create_task(refresh(entry_id, priority)))
+        await asyncio.sleep(0)
+    return tasks
+
+
+def test_startup_queue_order() -> None:
+    """Entries without a snapshot go first, then the others in the order they arrived."""
+
+    async def run() -> None:
+        queue = StartupQueue()
+        queue.set_limit("first", 1)
+        admitted: list[str] = []
+        finish: dict[str, asyncio.Event] = {}
+        tasks = await _queue_turns(
+            queue,
+            [
+                ("first", STARTUP_PRIORITY_RESTORED),
+                ("restored_a", STARTUP_PRIORITY_RESTORED),
+                ("empty_a", STARTUP_PRIORITY_NO_SNAPSHOT),
+                ("restored_b", STARTUP_PRIORITY_RESTORED),
+                ("empty_b", STARTUP_PRIORITY_NO_SNAPSHOT),
+            ],
+            admitted,
+            finish,
+        )
+        for _ in tasks:
+            await asyncio.sleep(0)
+            finish[admitted[-1]].set()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert admitted == ["first", "empty_a", "empty_b", "restored_a", "restored_b"]
+        assert queue.as_dict()["running"] == 0
+
+    asyncio.run(run())
+
+
+def test_startup_queue_admits_up_to_a_raised_parallelism() -> None:
+    """Raising the parallelism admits as many waiting entries as it now allows."""
+
+    async def run() -> None:
+        queue = StartupQueue()
+        queue.set_limit("entry", 1)
+        admitted: list[str] = []
+        finish: dict[str, asyncio.Event] = {}
+        entries = [(f"entry_{index}", STARTUP_PRIORITY_RESTORED) for index in range(4)]
+        tasks = await _queue_turns(queue, entries, admitted, finish)
+        assert admitted == ["entry_0"]
+        queue.set_limit("entry", 3)
+        await asyncio.sleep(0)
+        assert admitted == ["entry_0", "entry_1", "entry_2"]
+        assert queue.as_dict()["running"] == 3
+        for event in finish.values():
+            event.set()
+        await asyncio.gather(*tasks)
+        assert admitted == [entry_id for entry_id, _ in entries]
+        assert queue.as_dict()["running"] == 0
+
+    asyncio.run(run())
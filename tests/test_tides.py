@@ -0,0 +1,49 @@
+"""Check the tide timeline lookups."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.metservice_weather.model import TideEvent
+from custom_components.metservice_weather.tides import (
+    TIDE_FALLING,
+    TIDE_HIGH,
+    TIDE_LOW,
+    TIDE_RISING,
+    TideTimeline,
+)
+
+START = datetime(2024, 3, 10, 3, tzinfo=timezone.utc)
+
+
+def timeline(heights: bool = True) -> TideTimeline:
+    """Return a low, a high and a low tide six hours apart, with or without heights."""
+    return TideTimeline(
+        TideEvent(START + timedelta(hours=6 * index), tide_type, height if heights else None)
+        for index, (tide_type, height) in enumerate(((TIDE_LOW, 0.4), (TIDE_HIGH, 2.2), (TIDE_LOW, 0.5)))
+    )
+
+
+def test_trend_from_heights() -> None:
+    """The tide rises towards a higher tide and falls towards a lower one."""
+    tides = timeline()
+    assert tides.trend_at(START + timedelta(hours=3)) == TIDE_RISING
+    assert tides.trend_at(START + timedelta(hours=9)) == TIDE_FALLING
+    assert tides.height_at(START + timedelta(hours=3)) == pytest.approx(1.3)
+
+
+def test_trend_from_types_without_heights() -> None:
+    """Stations that publish times only still get a trend, but no height."""
+    tides = timeline(heights=False)
+    assert tides.trend_at(START + timedelta(hours=3)) == TIDE_RISING
+    assert tides.trend_at(START + timedelta(hours=9)) == TIDE_FALLING
+    assert tides.height_at(START + timedelta(hours=3)) is None
+
+
+def test_trend_outside_the_table() -> None:
+    """Nothing is known before the first tide or after the last."""
+    tides = timeline()
+    assert tides.trend_at(START - timedelta(hours=1)) is None
+    assert tides.trend_at(START + timedelta(hours=13)) is None